@@ -3,4 +3,5 @@ YouTube Monitoring Add-on - application package.
 
 - fetcher: YouTube 시청 기록 조회 (쿠키)
 - history_store: yt_history.json 읽기/쓰기
+- jsonutil: orjson(선택) / stdlib json 호환 래퍼
 """
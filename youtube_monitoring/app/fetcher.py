@@ -10,35 +10,227 @@ YouTube /feed/history 페이지에서 ytInitialData JSON 파싱.
 """
 from __future__ import annotations
 
-import json
 import logging
 import os
 import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from http.cookiejar import MozillaCookieJar
+from itertools import chain, islice
+from operator import itemgetter
 from typing import Any
 from urllib.parse import unquote
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from . import jsonutil
 
 _LOGGER = logging.getLogger(__name__)
 
 MAX_HISTORY_ITEMS = 20
 MAX_RECOMMENDED_ITEMS = 3
 
+# 모든 세션 공통 요청 헤더 (requests 기본 헤더 위에 덮어씀 - Accept-Encoding: gzip 유지)
+_SESSION_HEADERS: dict[str, str] = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-us,en;q=0.5",
+    "Sec-Fetch-Mode": "navigate",
+}
+
+_HISTORY_URL = "https://www.youtube.com/feed/history"
+_CHANNELS_URL = "https://www.youtube.com/feed/channels"
+_MAIN_URL = "https://www.youtube.com"
+
 # YouTube ytcfg에 LOGGED_IN 플래그가 매 응답마다 포함됨.
 # 만료된 쿠키일 경우 "LOGGED_IN":false 로 응답하므로 신뢰 가능한 지표.
-_LOGGED_IN_RE = re.compile(r'["\']LOGGED_IN["\']\s*:\s*(true|false)')
+_LOGGED_IN_RE = re.compile(rb'["\']LOGGED_IN["\']\s*:\s*(true|false)')
+
+# 매 호출마다 re 내부 캐시 조회를 피하기 위해 모듈 로드 시 1회 컴파일.
+_SUB_RE = re.compile(r"([\d.,]+)\s*(만|천|억|K|M|만명|천명|억명)?", re.IGNORECASE)
+# 구독자 수 단위 → 배수 (if/elif 문자열 비교 대신 dict 1회 조회)
+_UNIT_SCALE: dict[str, int] = {
+    "만": 10_000, "만명": 10_000,
+    "천": 1_000, "천명": 1_000,
+    "억": 100_000_000, "억명": 100_000_000,
+    "K": 1_000,
+    "M": 1_000_000,
+}
+# 파싱 결과 기본값/표식 문자열 - 모든 항목이 같은 객체를 공유하도록 intern
+_NA = sys.intern("N/A")
+_LIVE = sys.intern("LIVE")
+_LIVE_TEXTS = frozenset({"라이브", _LIVE})
+_SHORTS_CHANNEL = sys.intern("YouTube Shorts")
+_SHORTS_DURATION = sys.intern("Shorts")
+# 추천 영상 재귀 탐색 시 건너뛸 키 (무한 스크롤/광고 슬롯)
+_SKIP_KEYS = frozenset({"continuationItemRenderer", "adSlotRenderer"})
+# ytInitialData 대입문 시작 위치 (본문은 _read_until_initial_data 가 괄호 깊이로 추출).
+_YT_INITIAL_RE = re.compile(rb"var ytInitialData\s*=\s*\{")
+_YT_INITIAL_RE2 = re.compile(rb"ytInitialData\s*=\s*\{")
+# 스트리밍 수신 청크 크기
+_STREAM_CHUNK_SIZE = 64 * 1024
+# twoColumnBrowseResultsRenderer.tabs 배열 시작 키 (시청 기록은 이 하위 트리만 필요)
+_TWO_COLUMN_TABS_KEY = b'"twoColumnBrowseResultsRenderer":{"tabs":'
+# JSON 구조 문자 / 문자열 리터럴 나머지 ("\" 이스케이프 포함, 닫는 따옴표까지)
+_JSON_STRUCT_RE = re.compile(rb'[{}\[\]"]')
+_JSON_STRING_TAIL_RE = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+
+def _scan_json_container(buf: bytes, pos: int, depth: int) -> tuple[int, int, int]:
+    """
+    괄호 깊이 스캔을 buf[pos:] 부터 이어서 진행 (스트리밍 수신 시 이미 본 구간은 다시 보지 않음).
+    Returns: (짝이 맞는 닫는 괄호 다음 위치 또는 -1, 다음에 이어 스캔할 pos, depth).
+    문자열 리터럴이 buf 끝에서 잘렸으면 여는 따옴표 위치부터 다시 스캔하도록 pos 반환.
+    """
+    search = _JSON_STRUCT_RE.search
+    while True:
+        tok = search(buf, pos)
+        if tok is None:
+            return -1, len(buf), depth
+        ch = tok.group()
+        if ch == b'"':
+            tail = _JSON_STRING_TAIL_RE.match(buf, tok.end())
+            if tail is None:
+                return -1, tok.start(), depth
+            pos = tail.end()
+        elif ch == b"{" or ch == b"[":
+            pos = tok.end()
+            depth += 1
+        else:
+            pos = tok.end()
+            depth -= 1
+            if depth == 0:
+                return pos, pos, depth
+
+
+def _slice_json_container(buf: bytes, begin: int) -> bytes | None:
+    """
+    buf[begin] 의 `{` 또는 `[` 부터 짝이 맞는 닫는 괄호까지 슬라이스.
+    정규식 백트래킹 대신 문자열 리터럴을 건너뛰며 괄호 깊이를 추적해 한 번에 스캔.
+    """
+    if buf[begin:begin + 1] not in (b"{", b"["):
+        return None
+    end, _, _ = _scan_json_container(buf, begin, 0)
+    return buf[begin:end] if end >= 0 else None
+
+
+def _extract_json_value(buf: bytes, key: bytes) -> bytes | None:
+    """buf 에서 key(`"name":` 형태) 바로 뒤의 객체/배열 원문 슬라이스. 없으면 None."""
+    i = buf.find(key)
+    if i < 0:
+        return None
+    return _slice_json_container(buf, i + len(key))
+
+
+def _cache_validators(response: requests.Response) -> dict[str, str]:
+    """응답의 ETag / Last-Modified 로 다음 요청에 보낼 조건부 헤더 구성."""
+    headers: dict[str, str] = {}
+    etag = response.headers.get("ETag")
+    if etag:
+        headers["If-None-Match"] = etag
+    last_modified = response.headers.get("Last-Modified")
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _read_until_initial_data(response: requests.Response) -> tuple[bytes, bytes | None]:
+    """
+    stream=True 응답 본문을 청크 단위로 읽다가 ytInitialData 가 완결되면 나머지 수신을 중단.
+    ytInitialData 는 페이지 앞부분에 있어 뒤쪽 스크립트/트레일러 전송을 생략할 수 있음.
+    괄호 스캔은 마커 위치에서 시작해 새로 받은 구간만 이어서 진행 (청크마다 처음부터 다시 찾지 않음).
+    Returns: (받은 본문, ytInitialData JSON 슬라이스 또는 None). 못 찾으면 본문 전체를 읽음.
+    """
+    buf = bytearray()
+    begin = -1  # ytInitialData 여는 `{` 위치
+    scan_pos = depth = 0
+    raw: bytes | None = None
+    login_known = False
+    for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+        prev_len = len(buf)
+        buf += chunk
+        from_pos = max(0, prev_len - 64)  # 청크 경계에 걸친 마커 대비
+        if not login_known:
+            # LOGGED_IN 은 보통 ytInitialData 앞(ytcfg)에 있지만, 아직 못 봤으면 볼 때까지 계속 읽음
+            # (잘린 본문으로 판별 불가 → cookies_valid 갱신이 멈추는 것 방지)
+            login_known = (
+                _LOGGED_IN_RE.search(buf, from_pos) is not None
+                or buf.find(b'"DELEGATED_SESSION_ID":""', from_pos) >= 0
+            )
+        if raw is None:
+            if begin < 0:
+                m = _YT_INITIAL_RE.search(buf, from_pos) or _YT_INITIAL_RE2.search(buf, from_pos)
+                if m is None:
+                    continue
+                begin = scan_pos = m.end() - 1
+            end, scan_pos, depth = _scan_json_container(buf, scan_pos, depth)
+            if end >= 0:
+                raw = bytes(buf[begin:end])
+        if raw is not None and login_known:
+            break
+    return bytes(buf), raw
+
+
+def _item_key(item: Any) -> str | None:
+    """YouTube 렌더러 아이템({"xxxRenderer": {...}})의 태그 키. dict가 아니거나 비어 있으면 None."""
+    try:
+        return next(iter(item.keys()))
+    except (AttributeError, StopIteration):
+        return None
+
 
+def _safe_str(x: Any, default: str = _NA) -> str:
+    """비어 있지 않은 문자열이면 strip, 아니면 default."""
+    return x.strip() if type(x) is str and x else default
 
-def _check_html_logged_in(html: str) -> bool | None:
+
+def _dig(d: Any, *keys: str, default: Any = None) -> Any:
+    """
+    중첩 dict 경로 조회. 중간 키가 없거나 dict가 아니면 default.
+    `.get(k, {}).get(...)` 체인의 빈 dict 할당을 피함.
+    """
+    for k in keys:
+        if not isinstance(d, dict):
+            return default
+        d = d.get(k)
+        if d is None:
+            return default
+    return d
+
+
+def _starts_with_duration(text: str) -> bool:
+    """`M:SS` / `MM:SS` 로 시작하는지 (정규식 `^\\d{1,2}:\\d{2}` 대체, 문자열 연산만 사용)."""
+    i = text.find(":", 1, 3)
+    if i < 0:
+        return False
+    secs = text[i + 1:i + 3]
+    return len(secs) == 2 and text[:i].isdecimal() and secs.isdecimal()
+
+
+def _is_duration(text: str) -> bool:
+    """정확히 `M:SS`, `MM:SS`, `H:MM:SS` 형식인지 (정규식 `^\\d{1,2}:\\d{2}(:\\d{2})?$` 대체)."""
+    parts = text.split(":")
+    if not 2 <= len(parts) <= 3:
+        return False
+    head = parts[0]
+    if not (1 <= len(head) <= 2 and head.isdecimal()):
+        return False
+    return all(len(p) == 2 and p.isdecimal() for p in parts[1:])
+
+
+def _check_html_logged_in(html: bytes) -> bool | None:
     """YouTube HTML에서 로그인 상태 추출. None이면 판별 불가."""
     if not html:
         return None
     m = _LOGGED_IN_RE.search(html)
     if m:
-        return m.group(1) == "true"
+        return m.group(1) == b"true"
     # 보조 지표: DELEGATED_SESSION_ID 가 빈 값이면 비로그인
-    if '"DELEGATED_SESSION_ID":""' in html:
+    if b'"DELEGATED_SESSION_ID":""' in html:
         return False
     return None
 
@@ -48,11 +240,11 @@ def _parse_subscriber_count(text: str) -> int:
     구독자 수 문자열을 정수로 변환. 정렬용.
     예: "구독자 17만명" -> 170000, "1.23M" -> 1230000, "500천" -> 500000
     """
-    if not text or not isinstance(text, str):
+    text = _safe_str(text, "")
+    if not text:
         return 0
-    text = text.strip()
     # 숫자(정수 또는 소수) + 만/천/억 또는 K/M
-    match = re.search(r"([\d.,]+)\s*(만|천|억|K|M|만명|천명|억명)?", text, re.IGNORECASE)
+    match = _SUB_RE.search(text)
     if not match:
         return 0
     try:
@@ -60,18 +252,43 @@ def _parse_subscriber_count(text: str) -> int:
         num = float(num_str) if "." in num_str else int(num_str)
     except (ValueError, TypeError):
         return 0
-    unit = (match.group(2) or "").upper().replace("명", "").strip()
-    if unit in ("만", "만명"):
-        return int(num * 10_000)
-    if unit in ("천", "천명"):
-        return int(num * 1_000)
-    if unit in ("억", "억명"):
-        return int(num * 100_000_000)
-    if unit == "K":
-        return int(num * 1_000)
-    if unit == "M":
-        return int(num * 1_000_000)
-    return int(num)
+    unit = (match.group(2) or "").upper()
+    return int(num * _UNIT_SCALE.get(unit, 1))
+
+
+@dataclass(frozen=True, slots=True)
+class VideoItem:
+    """파싱된 영상 1건. dict 대비 메모리 절약, 외부 전달 시 as_dict()로 변환."""
+
+    channel: str
+    title: str
+    video_id: str
+    duration: str
+    thumbnail: str
+    url: str
+
+    def as_dict(self) -> dict[str, Any]:
+        """API/MQTT/저장소에서 쓰는 dict 형태로 변환."""
+        return {
+            "channel": self.channel,
+            "title": self.title,
+            "video_id": self.video_id,
+            "duration": self.duration,
+            "thumbnail": self.thumbnail,
+            "url": self.url,
+        }
+
+
+def _channel_sort_key(name: str) -> tuple[int, str]:
+    """한글(0) → 영어(1) → 특수문자/숫자(2) 순, 동일 그룹 내에서는 이름순."""
+    if not name:
+        return (2, name)
+    o = ord(name[0])
+    if 0xAC00 <= o <= 0xD7A3 or 0x3130 <= o <= 0x318F or 0x1100 <= o <= 0x11FF:
+        return (0, name)  # 한글
+    if (0x41 <= o <= 0x5A) or (0x61 <= o <= 0x7A):
+        return (1, name.lower())  # 영어
+    return (2, name)  # 숫자·특수문자 등
 
 
 class YouTubeHistoryFetcher:
@@ -80,16 +297,52 @@ class YouTubeHistoryFetcher:
     def __init__(self, cookies_path: str) -> None:
         self.cookies_path = cookies_path
         self.cookies_valid = False
-        self.history_data: list[dict[str, Any]] = []
+        self.history_version = 0  # history_data 내용이 바뀔 때마다 증가 (응답 ETag용)
+        self._history_data: list[dict[str, Any]] = []
         self.subscriptions_data: dict[str, Any] | None = None  # {total_count, channels: [{channel_name}]}
         self.recommended_data: list[dict[str, Any]] | None = None  # 최대 3개 추천 영상
+        self._session: requests.Session | None = None  # 쿠키 파일이 바뀔 때까지 재사용
+        self._cookies_mtime: float = 0.0
+        self._cookies_failed_mtime: float | None = None  # 로드 실패한 쿠키 파일 mtime (같으면 다시 파싱 안 함)
+        self._session_lock = threading.Lock()  # fetch_all 병렬 호출 시 세션 중복 생성 방지
+        # URL → 조건부 요청 헤더 (If-None-Match / If-Modified-Since). 파싱까지 성공한 응답만 기록.
+        self._validators: dict[str, dict[str, str]] = {}
+
+    @property
+    def history_data(self) -> list[dict[str, Any]]:
+        return self._history_data
+
+    @history_data.setter
+    def history_data(self, value: list[dict[str, Any]]) -> None:
+        # 같은 목록을 다시 받은 경우(피드 페이지는 보통 ETag 없음)는 버전 유지 → 응답 304/캐시 적중
+        if value != self._history_data:
+            self.history_version += 1
+        self._history_data = value
 
     def _get_session(self) -> requests.Session | None:
-        """Netscape 형식 쿠키 파일로 세션 생성."""
-        if not os.path.exists(self.cookies_path):
+        """
+        Netscape 형식 쿠키 파일로 세션 생성.
+        쿠키 파일 mtime이 그대로면 기존 세션(커넥션 풀/keep-alive 포함) 재사용.
+        """
+        with self._session_lock:
+            return self._get_session_locked()
+
+    def _get_session_locked(self) -> requests.Session | None:
+        """_get_session 본체. _session_lock 을 잡은 상태에서 호출."""
+        try:
+            mtime = os.stat(self.cookies_path).st_mtime
+        except OSError:
             _LOGGER.error("Cookies file not found: %s", self.cookies_path)
             self.cookies_valid = False
+            self._close_session()
             return None
+        if self._session is not None and mtime == self._cookies_mtime:
+            return self._session
+        if mtime == self._cookies_failed_mtime:
+            # 실패한 파일이 그대로면 재파싱/로그 반복 없이 바로 실패
+            self.cookies_valid = False
+            return None
+        self._close_session()
 
         cookie_jar = MozillaCookieJar(self.cookies_path)
         try:
@@ -97,42 +350,41 @@ class YouTubeHistoryFetcher:
         except OSError as err:
             _LOGGER.error("Failed to load cookies: %s", err)
             self.cookies_valid = False
+            self._cookies_failed_mtime = mtime
             return None
         except Exception as err:
             _LOGGER.error("Unexpected cookie load error: %s", err)
             self.cookies_valid = False
+            self._cookies_failed_mtime = mtime
             return None
 
         if len(cookie_jar) == 0:
             _LOGGER.error("Cookies file is empty")
             self.cookies_valid = False
+            self._cookies_failed_mtime = mtime
             return None
 
         session = requests.Session()
-        session.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-us,en;q=0.5",
-            "Sec-Fetch-Mode": "navigate",
-        }
+        session.headers.update(_SESSION_HEADERS)
         session.cookies = cookie_jar
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self._session = session
+        self._cookies_mtime = mtime
         return session
 
-    def _get_best_thumbnail(self, video_id: str) -> str:
-        """maxresdefault 있으면 사용, 없으면 0.jpg."""
-        if not video_id or video_id == "N/A":
+    def _close_session(self) -> None:
+        """캐시된 세션 정리 (쿠키 파일 변경/삭제 시)."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _get_thumbnail_url(self, video_id: str) -> str:
+        """hqdefault 썸네일 URL (모든 공개 영상에 존재, 네트워크 확인 없음)."""
+        if not video_id or video_id == _NA:
             return ""
-        url_base = f"https://img.youtube.com/vi/{video_id}"
-        try:
-            r = requests.get(f"{url_base}/maxresdefault.jpg", timeout=3)
-            if r.status_code == 200:
-                return f"{url_base}/maxresdefault.jpg"
-        except requests.exceptions.RequestException:
-            pass
-        return f"{url_base}/0.jpg"
+        return f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
 
-    def _extract_lockup_info(self, lockup: dict) -> dict[str, Any] | None:
+    def _extract_lockup_info(self, lockup: dict) -> VideoItem | None:
         """
         lockupViewModel 파싱 (YouTube 최신 UI).
         contentId, title, channel, duration, thumbnail 추출.
@@ -142,29 +394,29 @@ class YouTubeHistoryFetcher:
             if not video_id:
                 return None
 
-            metadata = lockup.get("metadata", {}).get("lockupMetadataViewModel", {})
-            title = metadata.get("title", {}).get("content", "N/A")
-            if title and isinstance(title, str):
-                title = title.strip()
-            else:
-                title = "N/A"
-
-            channel = "N/A"
-            metadata_rows = metadata.get("metadata", {}).get("contentMetadataViewModel", {}).get("metadataRows", [])
-            if metadata_rows:
-                first_row = metadata_rows[0]
-                parts = first_row.get("metadataParts", [])
-                if parts:
-                    channel = parts[0].get("text", {}).get("content", "N/A")
-                    if channel and isinstance(channel, str):
-                        channel = channel.strip()
-                    else:
-                        channel = "N/A"
+            try:
+                # 빠른 경로: 대부분의 lockup 은 구조가 고정 → 직접 인덱싱 한 번에 title/channel 추출
+                metadata = lockup["metadata"]["lockupMetadataViewModel"]
+                title = metadata["title"]["content"]
+                metadata_rows = metadata["metadata"]["contentMetadataViewModel"]["metadataRows"]
+                channel = metadata_rows[0]["metadataParts"][0]["text"]["content"]
+            except (KeyError, TypeError, IndexError):
+                # 일부 필드가 빠진 변형 구조 → 필드별로 안전하게 조회
+                metadata = _dig(lockup, "metadata", "lockupMetadataViewModel", default={})
+                title = _dig(metadata, "title", "content", default=_NA)
+                channel = _NA
+                metadata_rows = _dig(metadata, "metadata", "contentMetadataViewModel", "metadataRows", default=[])
+                if metadata_rows:
+                    parts = metadata_rows[0].get("metadataParts", [])
+                    if parts:
+                        channel = _dig(parts[0], "text", "content", default=_NA)
+
+            title = _safe_str(title)
+            channel = _safe_str(channel)
 
             # duration: overlay badge 또는 metadata에서 추출
-            duration = "N/A"
-            thumbnail_vm = lockup.get("contentImage", {}).get("thumbnailViewModel", {})
-            overlays = thumbnail_vm.get("overlays", [])
+            duration = _NA
+            overlays = _dig(lockup, "contentImage", "thumbnailViewModel", "overlays", default=[])
             for overlay in overlays:
                 if "thumbnailOverlayBadgeViewModel" in overlay:
                     badge_vm = overlay["thumbnailOverlayBadgeViewModel"]
@@ -174,13 +426,13 @@ class YouTubeHistoryFetcher:
                             badge_data = badge["thumbnailBadgeViewModel"]
                             text = badge_data.get("text", "")
                             badge_style = badge_data.get("badgeStyle", "")
-                            if badge_style == "THUMBNAIL_OVERLAY_BADGE_STYLE_LIVE" or text in ["라이브", "LIVE"]:
-                                duration = "LIVE"
+                            if badge_style == "THUMBNAIL_OVERLAY_BADGE_STYLE_LIVE" or text in _LIVE_TEXTS:
+                                duration = _LIVE
                                 break
-                            elif text and re.match(r"^\d{1,2}:\d{2}", text):
+                            elif text and _starts_with_duration(text):
                                 duration = text
                                 break
-                    if duration != "N/A":
+                    if duration != _NA:
                         break
                 elif "thumbnailOverlayTimeStatusRenderer" in overlay:
                     time_status = overlay["thumbnailOverlayTimeStatusRenderer"]
@@ -189,107 +441,133 @@ class YouTubeHistoryFetcher:
                         duration = text_obj["simpleText"]
                         break
                     elif "accessibility" in text_obj:
-                        duration = text_obj["accessibility"].get("accessibilityData", {}).get("label", "N/A")
+                        duration = _dig(text_obj, "accessibility", "accessibilityData", "label", default=_NA)
                         break
                 elif "thumbnailBottomOverlayViewModel" in overlay:
                     badges = overlay["thumbnailBottomOverlayViewModel"].get("badges", [])
                     for badge in badges:
                         if "thumbnailBadgeViewModel" in badge:
-                            duration = badge["thumbnailBadgeViewModel"].get("text", "N/A")
+                            duration = badge["thumbnailBadgeViewModel"].get("text", _NA)
                             break
-                    if duration != "N/A":
+                    if duration != _NA:
                         break
-            if duration == "N/A":
+            if duration == _NA:
                 for row in metadata_rows:
                     parts = row.get("metadataParts", [])
                     for part in parts:
-                        text = part.get("text", {}).get("content", "")
-                        if re.match(r"^\d{1,2}:\d{2}(:\d{2})?$", text):
+                        text = _dig(part, "text", "content", default="")
+                        if _is_duration(text):
                             duration = text
                             break
-                    if duration != "N/A":
+                    if duration != _NA:
                         break
 
-            return {
-                "channel": channel,
-                "title": title,
-                "video_id": video_id,
-                "duration": duration,
-                "thumbnail": self._get_best_thumbnail(video_id),
-                "url": f"https://www.youtube.com/watch?v={video_id}",
-            }
+            return VideoItem(
+                channel=channel,
+                title=title,
+                video_id=video_id,
+                duration=duration,
+                thumbnail=self._get_thumbnail_url(video_id),
+                url=f"https://www.youtube.com/watch?v={video_id}",
+            )
         except (KeyError, TypeError, AttributeError) as err:
             _LOGGER.debug("Extract lockup error: %s", err)
             return None
 
-    def _extract_video_renderer_info(self, vr: dict) -> dict[str, Any] | None:
+    def _extract_lockup_video(self, lockup: dict) -> VideoItem | None:
+        """lockupViewModel 중 일반 영상(LOCKUP_CONTENT_TYPE_VIDEO)만 파싱."""
+        if lockup.get("contentType") != "LOCKUP_CONTENT_TYPE_VIDEO":
+            return None
+        return self._extract_lockup_info(lockup)
+
+    def _extract_rich_item_info(self, rich: dict) -> VideoItem | None:
+        """richItemRenderer.content.videoRenderer 파싱."""
+        vr = _dig(rich, "content", "videoRenderer")
+        if vr is None:
+            return None
+        return self._extract_video_renderer_info(vr)
+
+    def _extract_reel_shelf_info(self, shelf: dict) -> VideoItem | None:
+        """reelShelfRenderer 의 첫 Shorts 항목 파싱."""
+        for ri in shelf.get("items", []):
+            if "shortsLockupViewModel" in ri:
+                return self._extract_shorts_info(ri["shortsLockupViewModel"])
+        return None
+
+    def _extract_video_renderer_info(self, vr: dict) -> VideoItem | None:
         """videoRenderer 파싱 (레거시 YouTube UI)."""
         try:
-            video_id = vr.get("videoId", "N/A")
-            title = "N/A"
+            video_id = vr.get("videoId", _NA)
+            title = _NA
             if "title" in vr:
                 td = vr["title"]
                 if "runs" in td and td["runs"]:
-                    title = td["runs"][0].get("text", "N/A")
+                    title = td["runs"][0].get("text", _NA)
                 elif "simpleText" in td:
                     title = td["simpleText"]
-                if isinstance(title, str):
-                    title = title.strip()
+                title = _safe_str(title)
 
-            channel = "N/A"
+            channel = _NA
             for key in ["longBylineText", "shortBylineText", "ownerText"]:
                 if key in vr:
                     byline = vr[key]
                     if "runs" in byline and byline["runs"]:
-                        channel = byline["runs"][0].get("text", "N/A")
+                        channel = byline["runs"][0].get("text", _NA)
                         break
                     elif "simpleText" in byline:
                         channel = byline["simpleText"]
                         break
 
-            return {
-                "channel": channel,
-                "title": title,
-                "video_id": video_id,
-                "duration": vr.get("lengthText", {}).get("simpleText", "N/A"),
-                "thumbnail": self._get_best_thumbnail(video_id),
-                "url": f"https://www.youtube.com/watch?v={video_id}",
-            }
+            return VideoItem(
+                channel=channel,
+                title=title,
+                video_id=video_id,
+                duration=_dig(vr, "lengthText", "simpleText", default=_NA),
+                thumbnail=self._get_thumbnail_url(video_id),
+                url=f"https://www.youtube.com/watch?v={video_id}",
+            )
         except (KeyError, TypeError, AttributeError) as err:
             _LOGGER.debug("Extract videoRenderer error: %s", err)
             return None
 
-    def _extract_shorts_info(self, shorts: dict) -> dict[str, Any] | None:
+    def _extract_shorts_info(self, shorts: dict) -> VideoItem | None:
         """shortsLockupViewModel 파싱 (YouTube Shorts)."""
         try:
             entity_id = shorts.get("entityId", "")
             video_id = entity_id.split("-")[-1] if entity_id else None
             if not video_id or video_id == "item":
-                video_id = (
-                    shorts.get("onTap", {})
-                    .get("innertubeCommand", {})
-                    .get("reelWatchEndpoint", {})
-                    .get("videoId")
-                )
+                video_id = _dig(shorts, "onTap", "innertubeCommand", "reelWatchEndpoint", "videoId")
             if not video_id:
                 return None
-            title = (
-                shorts.get("overlayMetadata", {})
-                .get("primaryText", {})
-                .get("content", "YouTube Shorts")
+            title = _dig(shorts, "overlayMetadata", "primaryText", "content", default=_SHORTS_CHANNEL)
+            return VideoItem(
+                channel=_SHORTS_CHANNEL,
+                title=title or _SHORTS_CHANNEL,
+                video_id=video_id,
+                duration=_SHORTS_DURATION,
+                thumbnail=self._get_thumbnail_url(video_id),
+                url=f"https://www.youtube.com/shorts/{video_id}",
             )
-            return {
-                "channel": "YouTube Shorts",
-                "title": title or "YouTube Shorts",
-                "video_id": video_id,
-                "duration": "Shorts",
-                "thumbnail": self._get_best_thumbnail(video_id),
-                "url": f"https://www.youtube.com/shorts/{video_id}",
-            }
         except (KeyError, TypeError, AttributeError) as err:
             _LOGGER.debug("Extract Shorts error: %s", err)
             return None
 
+    def fetch_all(self, include_recommended: bool = True) -> None:
+        """
+        시청 기록 / 구독 채널 / 추천 영상을 병렬 조회.
+        세 요청은 서로 독립적인 I/O이므로 스레드로 동시에 보내 대기 시간을 1회분으로 줄임.
+        """
+        tasks = [self.fetch_history, self.fetch_subscriptions]
+        if include_recommended:
+            tasks.append(self.fetch_recommended)
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = [executor.submit(task) for task in tasks]
+            wait(futures)
+        for future in futures:
+            err = future.exception()
+            if err is not None:
+                _LOGGER.error("Parallel fetch error: %s", err)
+
     def fetch_history(self) -> list[dict[str, Any]]:
         """
         /feed/history 페이지 조회 → ytInitialData 파싱 → 영상 목록 반환.
@@ -301,18 +579,24 @@ class YouTubeHistoryFetcher:
             return []
 
         try:
-            response = session.get("https://www.youtube.com/feed/history", timeout=10)
-            if response.status_code == 429:
-                _LOGGER.warning("YouTube rate limit (429). scan_interval을 늘려주세요.")
-                self.history_data = []
-                return []
-            response.raise_for_status()
+            conditional = self._validators.pop(_HISTORY_URL, None)
+            with session.get(_HISTORY_URL, timeout=10, stream=True, headers=conditional) as response:
+                if response.status_code == 304 and conditional:
+                    # 변경 없음 → 직전 파싱 결과 재사용
+                    self._validators[_HISTORY_URL] = conditional
+                    return self.history_data
+                if response.status_code == 429:
+                    _LOGGER.warning("YouTube rate limit (429). scan_interval을 늘려주세요.")
+                    self.history_data = []
+                    return []
+                response.raise_for_status()
+                validators = _cache_validators(response)
+                html, raw = _read_until_initial_data(response)
         except requests.exceptions.RequestException as err:
             _LOGGER.error("YouTube request error: %s", err)
             self.history_data = []
             return []
 
-        html = response.text
         # 로그인 상태 직접 검사 (만료된 쿠키 즉시 감지)
         logged_in = _check_html_logged_in(html)
         if logged_in is not None:
@@ -323,18 +607,20 @@ class YouTubeHistoryFetcher:
                 self.history_data = []
                 return []
 
-        # ytInitialData JSON 추출 (두 가지 패턴 지원)
-        match = re.search(r"var ytInitialData\s*=\s*({.*?});", html, re.DOTALL)
-        if not match:
-            match = re.search(r"ytInitialData\s*=\s*({.*?});", html, re.DOTALL)
-        if not match:
+        # ytInitialData JSON (수신 중 추출, 두 가지 패턴 지원)
+        if raw is None:
             _LOGGER.error("Cannot find ytInitialData in response")
             self.history_data = []
             return []
 
+        # 필요한 tabs 하위 트리만 잘라 파싱 (전체 ytInitialData 객체 생성 회피). 못 찾으면 전체 파싱.
+        tabs_raw = _extract_json_value(raw, _TWO_COLUMN_TABS_KEY)
         try:
-            data = json.loads(match.group(1))
-        except json.JSONDecodeError as err:
+            if tabs_raw is not None:
+                tabs = jsonutil.loads(tabs_raw)
+            else:
+                tabs = _dig(jsonutil.loads(raw), "contents", "twoColumnBrowseResultsRenderer", "tabs")
+        except jsonutil.JSONDecodeError as err:
             _LOGGER.error("Parse ytInitialData error: %s", err)
             self.history_data = []
             return []
@@ -342,12 +628,10 @@ class YouTubeHistoryFetcher:
         # 탭 → 섹션 → itemSectionRenderer.contents 경로 수집
         all_paths: list[list] = []
         try:
-            tabs = data["contents"]["twoColumnBrowseResultsRenderer"]["tabs"]
             for tab in tabs:
                 if "tabRenderer" not in tab:
                     continue
-                content = tab["tabRenderer"].get("content", {})
-                sections = content.get("sectionListRenderer", {}).get("contents", [])
+                sections = _dig(tab["tabRenderer"], "content", "sectionListRenderer", "contents", default=[])
                 for section in sections:
                     if "itemSectionRenderer" in section:
                         contents = section["itemSectionRenderer"].get("contents", [])
@@ -361,52 +645,66 @@ class YouTubeHistoryFetcher:
             return []
 
         # 우선순위별 수집: lockup(일반) > videoRenderer(일반) > Shorts
-        lockups: list[dict[str, Any]] = []
-        video_renderers: list[dict[str, Any]] = []
-        shorts_list: list[dict[str, Any]] = []
+        # 각 목록은 MAX_HISTORY_ITEMS 개까지만 채우고, lockup 만으로 다 차면 즉시 중단.
+        lockups: list[VideoItem] = []
+        video_renderers: list[VideoItem] = []
+        shorts_list: list[VideoItem] = []
+        # 아이템 태그 키 → (수집 목록, 추출 함수). 키 1회 해시 조회로 분기.
+        handlers = {
+            "lockupViewModel": (lockups, self._extract_lockup_video),
+            "videoRenderer": (video_renderers, self._extract_video_renderer_info),
+            "richItemRenderer": (video_renderers, self._extract_rich_item_info),
+            "reelShelfRenderer": (shorts_list, self._extract_reel_shelf_info),
+        }
 
         for path in all_paths:
+            if len(lockups) >= MAX_HISTORY_ITEMS:
+                break
+            keyed = [(_item_key(item), item) for item in path]
             # messageRenderer = 빈 히스토리 또는 일시정지 메시지 → 스킵
-            for item in path:
-                if isinstance(item, dict) and "messageRenderer" in item:
-                    break
-            else:
-                for item in path:
-                    if not isinstance(item, dict):
-                        continue
-                    if "lockupViewModel" in item:
-                        lockup = item["lockupViewModel"]
-                        if lockup.get("contentType") == "LOCKUP_CONTENT_TYPE_VIDEO":
-                            v = self._extract_lockup_info(lockup)
-                            if v:
-                                lockups.append(v)
-                    elif "videoRenderer" in item:
-                        v = self._extract_video_renderer_info(item["videoRenderer"])
-                        if v:
-                            video_renderers.append(v)
-                    elif "richItemRenderer" in item:
-                        c = item["richItemRenderer"].get("content", {})
-                        if "videoRenderer" in c:
-                            v = self._extract_video_renderer_info(c["videoRenderer"])
-                            if v:
-                                video_renderers.append(v)
-                    elif "reelShelfRenderer" in item:
-                        for ri in item["reelShelfRenderer"].get("items", []):
-                            if "shortsLockupViewModel" in ri:
-                                v = self._extract_shorts_info(ri["shortsLockupViewModel"])
-                                if v:
-                                    shorts_list.append(v)
-                                break
+            if any(key == "messageRenderer" for key, _ in keyed):
+                continue
+            for key, item in keyed:
+                try:
+                    bucket, extract = handlers[key]
+                except KeyError:
+                    continue
+                if len(bucket) >= MAX_HISTORY_ITEMS:
+                    continue
+                v = extract(item[key])
+                if v:
+                    bucket.append(v)
+                    if bucket is lockups and len(lockups) >= MAX_HISTORY_ITEMS:
+                        break
 
-        history_list = lockups + video_renderers + shorts_list
-        self.history_data = history_list[:MAX_HISTORY_ITEMS]
+        # 외부(API/MQTT/저장소)에는 dict 형태로 전달 - 변환은 최종 MAX_HISTORY_ITEMS 개만
+        self.history_data = [
+            v.as_dict() for v in islice(chain(lockups, video_renderers, shorts_list), MAX_HISTORY_ITEMS)
+        ]
         # 로그인 마커가 명시적으로 발견된 경우에만 valid 갱신 (위에서 처리)
         # 그렇지 않으면 데이터 존재 여부를 보조 지표로 사용
-        if history_list and not self.cookies_valid:
+        if self.history_data and not self.cookies_valid:
             # 데이터는 있는데 마커가 명시 안 됨 → 일단 유효로 간주 (보수적)
             self.cookies_valid = True
+        if validators:
+            self._validators[_HISTORY_URL] = validators
         return self.history_data
 
+    def fetch_history_delta(self, since_video_id: str | None) -> list[dict[str, Any]]:
+        """
+        fetch_history 후 since_video_id보다 최근 항목만 반환 (최신순).
+        since_video_id가 없거나 목록에 없으면 가장 최근 1건 (기존 폴링과 동일),
+        변화 없으면(304 포함) 빈 리스트.
+        """
+        videos = self.fetch_history()
+        if not videos:
+            return []
+        if since_video_id is not None:
+            for i, v in enumerate(videos):
+                if v.get("video_id") == since_video_id:
+                    return videos[:i]
+        return videos[:1]
+
     def fetch_subscriptions(self) -> dict[str, Any] | None:
         """
         /feed/channels 페이지 조회 → 구독 채널 목록 반환.
@@ -418,17 +716,23 @@ class YouTubeHistoryFetcher:
             return None
 
         try:
-            response = session.get("https://www.youtube.com/feed/channels", timeout=10)
-            if response.status_code == 429:
-                _LOGGER.warning("YouTube rate limit (429). scan_interval을 늘려주세요.")
-                return self.subscriptions_data  # 기존 데이터 유지
-            response.raise_for_status()
+            conditional = self._validators.pop(_CHANNELS_URL, None)
+            with session.get(_CHANNELS_URL, timeout=10, stream=True, headers=conditional) as response:
+                if response.status_code == 304 and conditional:
+                    # 변경 없음 → 직전 파싱 결과 재사용
+                    self._validators[_CHANNELS_URL] = conditional
+                    return self.subscriptions_data
+                if response.status_code == 429:
+                    _LOGGER.warning("YouTube rate limit (429). scan_interval을 늘려주세요.")
+                    return self.subscriptions_data  # 기존 데이터 유지
+                response.raise_for_status()
+                validators = _cache_validators(response)
+                html, raw = _read_until_initial_data(response)
         except requests.exceptions.RequestException as err:
             _LOGGER.error("YouTube subscriptions request error: %s", err)
             self.subscriptions_data = None
             return None
 
-        html = response.text
         logged_in = _check_html_logged_in(html)
         if logged_in is not None:
             if not logged_in and self.cookies_valid:
@@ -437,17 +741,14 @@ class YouTubeHistoryFetcher:
             if not logged_in:
                 self.subscriptions_data = {"total_count": 0, "channels": []}
                 return self.subscriptions_data
-        match = re.search(r"var ytInitialData\s*=\s*({.*?});", html, re.DOTALL)
-        if not match:
-            match = re.search(r"ytInitialData\s*=\s*({.*?});", html, re.DOTALL)
-        if not match:
+        if raw is None:
             _LOGGER.debug("Cannot find ytInitialData in channels page")
             self.subscriptions_data = {"total_count": 0, "channels": []}
             return self.subscriptions_data
 
         try:
-            data = json.loads(match.group(1))
-        except json.JSONDecodeError as err:
+            data = jsonutil.loads(raw)
+        except jsonutil.JSONDecodeError as err:
             _LOGGER.error("Parse channels ytInitialData error: %s", err)
             self.subscriptions_data = {"total_count": 0, "channels": []}
             return self.subscriptions_data
@@ -483,15 +784,13 @@ class YouTubeHistoryFetcher:
             self.subscriptions_data = {"total_count": 0, "channels": []}
             return self.subscriptions_data
 
-        channels = []
+        keyed: list[tuple[tuple[int, str], dict[str, Any]]] = []
+        append_channel = keyed.append
         for item in channel_list:
             if "channelRenderer" not in item:
                 continue
             ch = item["channelRenderer"]
-            title = ch.get("title", {}).get("simpleText", "")
-            if not title or not isinstance(title, str):
-                continue
-            title = title.strip()
+            title = _safe_str(_dig(ch, "title", "simpleText"), "")
             if not title:
                 continue
 
@@ -508,7 +807,7 @@ class YouTubeHistoryFetcher:
                 handle = sct.get("simpleText", "") or ""
 
             thumbnail_url = ""
-            thumb = ch.get("thumbnail", {}).get("thumbnails", [])
+            thumb = _dig(ch, "thumbnail", "thumbnails", default=[])
             if thumb:
                 best = thumb[-1] if thumb else {}
                 url = best.get("url", "")
@@ -518,20 +817,20 @@ class YouTubeHistoryFetcher:
 
             channel_url = ""
             try:
-                base_url = ch.get("navigationEndpoint", {}).get("browseEndpoint", {}).get("canonicalBaseUrl", "")
+                base_url = _dig(ch, "navigationEndpoint", "browseEndpoint", "canonicalBaseUrl", default="")
                 if base_url:
                     channel_url = "https://www.youtube.com" + unquote(base_url)
             except (TypeError, KeyError):
                 pass
 
             description_snippet = ""
-            runs = ch.get("descriptionSnippet", {}).get("runs", [])
+            runs = _dig(ch, "descriptionSnippet", "runs", default=[])
             if runs and isinstance(runs[0], dict):
                 description_snippet = runs[0].get("text", "") or ""
 
             channel_id = ch.get("channelId", "")
 
-            channels.append({
+            append_channel((_channel_sort_key(title), {
                 "channel_name": title,
                 "channel_id": channel_id,
                 "subscriber_count_text": subscriber_count_text,
@@ -540,27 +839,19 @@ class YouTubeHistoryFetcher:
                 "thumbnail": thumbnail_url,
                 "channel_url": channel_url,
                 "description_snippet": description_snippet,
-            })
-
-        def _channel_sort_key(c: dict) -> tuple[int, str]:
-            """한글(0) → 영어(1) → 특수문자/숫자(2) 순, 동일 그룹 내에서는 이름순."""
-            name = c.get("channel_name", "") or ""
-            if not name:
-                return (2, name)
-            o = ord(name[0])
-            if 0xAC00 <= o <= 0xD7A3 or 0x3130 <= o <= 0x318F or 0x1100 <= o <= 0x11FF:
-                return (0, name)  # 한글
-            if (0x41 <= o <= 0x5A) or (0x61 <= o <= 0x7A):
-                return (1, name.lower())  # 영어
-            return (2, name)  # 숫자·특수문자 등
-
-        channels.sort(key=_channel_sort_key)
+            }))
+
+        # 정렬 키는 수집 시 1회만 계산해 두고 C 레벨 itemgetter로 정렬
+        keyed.sort(key=itemgetter(0))
+        channels = [c for _, c in keyed]
 
         self.subscriptions_data = {"total_count": len(channels), "channels": channels}
         # cookies_valid는 위 LOGGED_IN 마커에서 이미 갱신됨.
         # 마커가 없는 경우 채널 데이터 존재로 보조 판정.
         if channels and not self.cookies_valid:
             self.cookies_valid = True
+        if validators:
+            self._validators[_CHANNELS_URL] = validators
         return self.subscriptions_data
 
     def fetch_recommended(self) -> list[dict[str, Any]] | None:
@@ -574,17 +865,23 @@ class YouTubeHistoryFetcher:
             return None
 
         try:
-            response = session.get("https://www.youtube.com", timeout=10)
-            if response.status_code == 429:
-                _LOGGER.warning("YouTube rate limit (429). scan_interval을 늘려주세요.")
-                return self.recommended_data or []
-            response.raise_for_status()
+            conditional = self._validators.pop(_MAIN_URL, None)
+            with session.get(_MAIN_URL, timeout=10, stream=True, headers=conditional) as response:
+                if response.status_code == 304 and conditional:
+                    # 변경 없음 → 직전 파싱 결과 재사용
+                    self._validators[_MAIN_URL] = conditional
+                    return self.recommended_data or []
+                if response.status_code == 429:
+                    _LOGGER.warning("YouTube rate limit (429). scan_interval을 늘려주세요.")
+                    return self.recommended_data or []
+                response.raise_for_status()
+                validators = _cache_validators(response)
+                html, raw = _read_until_initial_data(response)
         except requests.exceptions.RequestException as err:
             _LOGGER.error("YouTube recommended request error: %s", err)
             self.recommended_data = None
             return None
 
-        html = response.text
         logged_in = _check_html_logged_in(html)
         if logged_in is not None:
             if not logged_in and self.cookies_valid:
@@ -593,40 +890,36 @@ class YouTubeHistoryFetcher:
             if not logged_in:
                 self.recommended_data = []
                 return []
-        match = re.search(r"var ytInitialData\s*=\s*({.*?});", html, re.DOTALL)
-        if not match:
-            match = re.search(r"ytInitialData\s*=\s*({.*?});\s*(?:var |$)", html, re.DOTALL)
-        if not match:
+        if raw is None:
             _LOGGER.debug("Cannot find ytInitialData in YouTube main page")
             self.recommended_data = []
             return []
 
         try:
-            data = json.loads(match.group(1))
-        except json.JSONDecodeError as err:
+            data = jsonutil.loads(raw)
+        except jsonutil.JSONDecodeError as err:
             _LOGGER.debug("Parse ytInitialData error: %s", err)
             self.recommended_data = []
             return []
 
         videos = self._parse_recommended_from_data(data)
-        self.recommended_data = videos[:MAX_RECOMMENDED_ITEMS]
+        self.recommended_data = [v.as_dict() for v in videos[:MAX_RECOMMENDED_ITEMS]]
         # cookies_valid는 위 LOGGED_IN 마커에서 이미 갱신됨.
         if videos and not self.cookies_valid:
             self.cookies_valid = True
+        if validators:
+            self._validators[_MAIN_URL] = validators
         return self.recommended_data
 
-    def _parse_recommended_from_data(self, data: dict) -> list[dict[str, Any]]:
+    def _parse_recommended_from_data(self, data: dict) -> list[VideoItem]:
         """ytInitialData에서 추천 영상 추출. 여러 경로 시도."""
-        videos: list[dict[str, Any]] = []
+        videos: list[VideoItem] = []
 
         # 경로 1: twoColumnBrowseResultsRenderer.tabs → richGridRenderer.contents
         try:
-            tabs = data.get("contents", {}).get("twoColumnBrowseResultsRenderer", {}).get("tabs", [])
+            tabs = _dig(data, "contents", "twoColumnBrowseResultsRenderer", "tabs", default=[])
             for tab in tabs:
-                tr = tab.get("tabRenderer", {})
-                content = tr.get("content", {})
-                grid = content.get("richGridRenderer", {})
-                items = grid.get("contents", [])
+                items = _dig(tab, "tabRenderer", "content", "richGridRenderer", "contents", default=[])
 
                 for item in items:
                     v = self._extract_video_from_grid_item(item)
@@ -642,9 +935,9 @@ class YouTubeHistoryFetcher:
         # 경로 2: sectionListRenderer (섹션별 레이아웃)
         if len(videos) < MAX_RECOMMENDED_ITEMS:
             try:
-                sections = data.get("contents", {}).get("sectionListRenderer", {}).get("contents", [])
+                sections = _dig(data, "contents", "sectionListRenderer", "contents", default=[])
                 for section in sections:
-                    for item in section.get("itemSectionRenderer", {}).get("contents", []):
+                    for item in _dig(section, "itemSectionRenderer", "contents", default=[]):
                         v = self._extract_video_from_grid_item(item)
                         if v:
                             videos.append(v)
@@ -661,9 +954,9 @@ class YouTubeHistoryFetcher:
 
         return videos
 
-    def _extract_video_from_grid_item(self, item: dict) -> dict[str, Any] | None:
+    def _extract_video_from_grid_item(self, item: dict) -> VideoItem | None:
         """그리드 아이템에서 영상 정보 추출 (다양한 래퍼 지원)."""
-        content = item.get("richItemRenderer", {}).get("content", item)
+        content = _dig(item, "richItemRenderer", "content", default=item)
 
         if "lockupViewModel" in content:
             lockup = content["lockupViewModel"]
@@ -673,35 +966,35 @@ class YouTubeHistoryFetcher:
             return self._extract_video_renderer_info(content["videoRenderer"])
         return None
 
-    def _find_videos_in_dict(self, obj: Any, max_count: int = 3, max_depth: int = 8) -> list[dict[str, Any]]:
-        """딕셔너리/리스트를 재귀 탐색하여 lockupViewModel 또는 videoRenderer 추출 (깊이 제한)."""
-        videos: list[dict[str, Any]] = []
-
-        def _collect(node: Any, depth: int) -> None:
-            if len(videos) >= max_count or depth > max_depth:
-                return
+    def _find_videos_in_dict(self, obj: Any, max_count: int = 3, max_depth: int = 8) -> list[VideoItem]:
+        """딕셔너리/리스트를 명시적 스택으로 깊이 우선 탐색하여 lockupViewModel 또는 videoRenderer 추출 (깊이 제한)."""
+        videos: list[VideoItem] = []
+        stack: list[tuple[Any, int]] = [(obj, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > max_depth:
+                continue
             if isinstance(node, dict):
                 if "lockupViewModel" in node:
-                    lockup = node["lockupViewModel"]
-                    if lockup.get("contentType") == "LOCKUP_CONTENT_TYPE_VIDEO":
-                        v = self._extract_lockup_info(lockup)
-                        if v:
-                            videos.append(v)
-                    return
+                    v = self._extract_lockup_video(node["lockupViewModel"])
+                    if v:
+                        videos.append(v)
+                        if len(videos) >= max_count:
+                            return videos
+                    continue
                 if "videoRenderer" in node:
                     v = self._extract_video_renderer_info(node["videoRenderer"])
                     if v:
                         videos.append(v)
-                    return
-                for k, v in node.items():
-                    if k in ("continuationItemRenderer", "adSlotRenderer"):
-                        continue
-                    _collect(v, depth + 1)
+                        if len(videos) >= max_count:
+                            return videos
+                    continue
+                # 원래 순서대로 방문하도록 역순으로 push
+                stack.extend(
+                    (child, depth + 1)
+                    for k, child in reversed(node.items())
+                    if k not in _SKIP_KEYS
+                )
             elif isinstance(node, list):
-                for x in node:
-                    _collect(x, depth + 1)
-                    if len(videos) >= max_count:
-                        return
-
-        _collect(obj, 0)
+                stack.extend((child, depth + 1) for child in reversed(node))
         return videos
@@ -2,15 +2,20 @@
 YouTube 시청 기록 영속화 - /data/yt_history.json.
 
 형식: { "YYYY-MM-DD": [ { video_id, title, channel, thumbnail, url, duration, timestamp }, ... ] }
+날짜별 리스트는 오래된 순(append). 최신순 표시는 읽는 쪽에서 reversed() 사용.
+파일은 공백 없는 compact JSON. 사람이 볼 때는 `python -m json.tool yt_history.json`.
 """
 from __future__ import annotations
 
-import json
 import logging
 import os
-from collections import defaultdict
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
+
+from . import jsonutil
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,7 +23,7 @@ HISTORY_FILE = "/data/yt_history.json"
 FALLBACK_FILE = "yt_history.json"
 
 
-def _get_history_path() -> str:
+def _resolve_history_path() -> str:
     """
     쓰기 가능한 히스토리 파일 경로 반환.
     우선순위: /data (에드온) > /share (HA) > 로컬 상대경로.
@@ -35,20 +40,37 @@ def _get_history_path() -> str:
     return os.path.join(os.path.dirname(__file__), "..", FALLBACK_FILE)
 
 
+# 저장 경로는 프로세스 동안 바뀌지 않으므로 import 시 한 번만 결정. 환경변수로 재지정 가능.
+HISTORY_PATH = os.environ.get("YT_HISTORY_PATH") or _resolve_history_path()
+# 추가분만 한 줄씩 기록하는 저널. 본 파일 저장(compact) 시 삭제.
+JOURNAL_PATH = os.path.splitext(HISTORY_PATH)[0] + ".jsonl"
+
+
+def _migrate_order(history: dict[str, list[dict[str, Any]]]) -> None:
+    """이전 형식(최신순 insert(0)) 리스트를 오래된 순으로 뒤집음. 이미 변환된 리스트는 그대로."""
+    for entries in history.values():
+        if (
+            isinstance(entries, list)
+            and len(entries) > 1
+            and str(entries[0].get("timestamp", "")) > str(entries[-1].get("timestamp", ""))
+        ):
+            entries.reverse()
+
+
 def load_history() -> dict[str, list[dict[str, Any]]]:
     """파일에서 히스토리 로드. 형식 오류 시 빈 dict 반환."""
-    path = _get_history_path()
+    path = HISTORY_PATH
     if not os.path.exists(path):
         return {}
 
     try:
-        with open(path, encoding="utf-8") as f:
-            data = json.load(f)
+        data = jsonutil.load_file(path)
         if isinstance(data, dict):
+            _migrate_order(data)
             return data
         _LOGGER.warning("History file is not a dict, ignoring")
         return {}
-    except json.JSONDecodeError as err:
+    except jsonutil.JSONDecodeError as err:
         _LOGGER.warning("Invalid JSON in history file: %s", err)
         return {}
     except OSError as err:
@@ -56,16 +78,146 @@ def load_history() -> dict[str, list[dict[str, Any]]]:
         return {}
 
 
-def save_history(history: dict[str, list[dict[str, Any]]]) -> None:
-    """히스토리를 파일에 저장. 디렉터리 없으면 생성."""
-    path = _get_history_path()
+def build_video_id_index(history: dict[str, list[dict[str, Any]]]) -> set[str]:
+    """히스토리 전체의 video_id 집합 (has_video_id O(1) 조회용). 저장되지 않음."""
+    return {
+        vid
+        for entries in history.values()
+        for e in entries
+        if (vid := e.get("video_id"))
+    }
+
+
+def load_history_with_index() -> tuple[dict[str, list[dict[str, Any]]], set[str]]:
+    """히스토리와 video_id 인덱스를 함께 로드."""
+    history = load_history()
+    return history, build_video_id_index(history)
+
+
+@dataclass(frozen=True, slots=True)
+class VideoEntry:
+    """
+    히스토리 항목 1건 (HistoryStore 메모리 형식). dict 대비 메모리 절약.
+    is_shorts는 생성 시 한 번 계산, 파일에는 저장하지 않음.
+    """
+
+    video_id: str
+    title: str
+    channel: str
+    thumbnail: str
+    url: str
+    duration: str
+    timestamp: str
+    is_shorts: bool
+
+    @classmethod
+    def create(
+        cls,
+        video_id: str,
+        title: str = "N/A",
+        channel: str = "N/A",
+        thumbnail: str = "",
+        url: str = "",
+        duration: str = "N/A",
+        timestamp: str = "",
+    ) -> VideoEntry:
+        is_shorts = (
+            duration == "Shorts"
+            or channel == "YouTube Shorts"
+            or "/shorts/" in url
+        )
+        return cls(video_id, title, channel, thumbnail, url, duration, timestamp, is_shorts)
+
+    @classmethod
+    def from_dict(cls, e: dict[str, Any]) -> VideoEntry:
+        get = e.get
+        return cls.create(
+            get("video_id") or "",
+            get("title", "N/A"),
+            get("channel", "N/A"),
+            get("thumbnail") or "",
+            get("url") or "",
+            get("duration", "N/A"),
+            get("timestamp") or "",
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """파일/API에서 쓰는 dict 형태로 변환."""
+        return {
+            "video_id": self.video_id,
+            "title": self.title,
+            "channel": self.channel,
+            "thumbnail": self.thumbnail,
+            "url": self.url,
+            "duration": self.duration,
+            "timestamp": self.timestamp,
+        }
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, VideoEntry):
+        return obj.as_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def save_history(history: dict[str, list[Any]]) -> bool:
+    """
+    히스토리를 파일에 저장 (임시 파일 + os.replace). 디렉터리 없으면 생성. 성공 여부 반환.
+    항목은 dict 또는 VideoEntry.
+    """
+    path = HISTORY_PATH
     dir_path = os.path.dirname(path) or "."
     try:
         os.makedirs(dir_path, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
+        jsonutil.dump_file(path, history, default=_json_default)
+        return True
     except OSError as err:
         _LOGGER.error("Failed to save history: %s", err)
+        return False
+
+
+def _append_journal(date_str: str, entry: dict[str, Any]) -> None:
+    """저널에 추가 항목 한 줄 기록 ({"date": ..., "entry": {...}})."""
+    try:
+        with open(JOURNAL_PATH, "ab") as f:
+            f.write(jsonutil.dumps({"date": date_str, "entry": entry}) + b"\n")
+    except OSError as err:
+        _LOGGER.error("Failed to append history journal: %s", err)
+
+
+def _replay_journal(history: dict[str, list[dict[str, Any]]], index: set[str]) -> int:
+    """저널 항목을 history에 반영 (이미 있는 video_id, 깨진 줄은 건너뜀). 반영 개수 반환."""
+    try:
+        with open(JOURNAL_PATH, "rb") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return 0
+    except OSError as err:
+        _LOGGER.warning("Failed to read history journal: %s", err)
+        return 0
+    replayed = 0
+    for line in lines:
+        try:
+            rec = jsonutil.loads(line)
+            date_str, entry = rec["date"], rec["entry"]
+            vid = entry.get("video_id")
+        except (jsonutil.JSONDecodeError, KeyError, TypeError, AttributeError):
+            continue  # 기록 중 중단된 마지막 줄 등
+        if not vid or vid in index:
+            continue
+        history.setdefault(date_str, []).append(entry)
+        index.add(vid)
+        replayed += 1
+    return replayed
+
+
+def _remove_journal() -> None:
+    try:
+        os.remove(JOURNAL_PATH)
+    except FileNotFoundError:
+        pass
+    except OSError as err:
+        _LOGGER.warning("Failed to remove history journal: %s", err)
 
 
 def add_entry(
@@ -77,10 +229,12 @@ def add_entry(
     url: str,
     duration: str = "N/A",
     timestamp: datetime | None = None,
+    index: set[str] | None = None,
 ) -> dict[str, list[dict[str, Any]]]:
-    """새 항목 추가. 해당 날짜 리스트 맨 앞에 삽입."""
+    """새 항목 추가. 해당 날짜 리스트 끝에 append. index가 있으면 함께 갱신."""
     ts = timestamp or datetime.now()
-    date_str = ts.strftime("%Y-%m-%d")
+    ts_iso = ts.isoformat()
+    date_str = ts_iso[:10]
     entry = {
         "video_id": video_id,
         "title": title,
@@ -88,16 +242,27 @@ def add_entry(
         "thumbnail": thumbnail,
         "url": url,
         "duration": duration,
-        "timestamp": ts.isoformat(),
+        "timestamp": ts_iso,
     }
     if date_str not in history:
         history[date_str] = []
-    history[date_str].insert(0, entry)
+    history[date_str].append(entry)
+    if index is not None:
+        index.add(video_id)
     return history
 
 
-def has_video_id(history: dict[str, list[dict[str, Any]]], video_id: str) -> bool:
-    """히스토리에 video_id가 이미 존재하는지 확인 (중복 저장 방지)."""
+def has_video_id(
+    history: dict[str, list[dict[str, Any]]],
+    video_id: str,
+    index: set[str] | None = None,
+) -> bool:
+    """
+    히스토리에 video_id가 이미 존재하는지 확인 (중복 저장 방지).
+    index(build_video_id_index 결과)가 있으면 O(1) 조회.
+    """
+    if index is not None:
+        return video_id in index
     for entries in history.values():
         for e in entries:
             if e.get("video_id") == video_id:
@@ -105,38 +270,140 @@ def has_video_id(history: dict[str, list[dict[str, Any]]], video_id: str) -> boo
     return False
 
 
-def _is_shorts(entry: dict[str, Any]) -> bool:
-    """Shorts 여부: duration 또는 channel로 판별."""
-    return (
-        entry.get("duration") == "Shorts"
-        or entry.get("channel") == "YouTube Shorts"
-    )
+class HistoryStore:
+    """
+    메모리에 유지하는 히스토리(날짜 -> VideoEntry 리스트) + video_id 인덱스.
+    compact_every=1: add_entry마다 본 파일 저장 (buffered() 안에서는 종료 시 한 번).
+    compact_every>1: add_entry는 저널에 한 줄 추가만 (본 파일 저장 안 함).
+        미반영 항목이 compact_every개 쌓이면 needs_compact → 호출 측이 flush()로 본 파일에 합침.
+    스레드 안전하지 않음 (호출 측에서 잠금).
+    """
 
+    def __init__(self, compact_every: int = 1) -> None:
+        self.history: dict[str, list[VideoEntry]] = {}
+        self._index: set[str] = set()
+        self._dirty = False
+        self._buffer_depth = 0
+        self._compact_every = max(1, compact_every)
+        self._pending = 0  # 저널에만 있고 본 파일에 반영 안 된 항목 수
+        self._has_journal = False
 
-def get_monthly_stats(history: dict[str, list[dict[str, Any]]]) -> dict[str, int]:
-    """월별 시청 개수 (전체). { "YYYY-MM": count } 최신순. 하위 호환용."""
-    monthly: dict[str, int] = defaultdict(int)
-    for date_str, entries in history.items():
-        if len(date_str) >= 7:
-            month = date_str[:7]
-            monthly[month] += len(entries)
-    return dict(sorted(monthly.items(), reverse=True))
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
 
+    @property
+    def needs_compact(self) -> bool:
+        """저널 미반영 항목이 compact_every개 이상인지 (flush 권장)."""
+        return self._pending >= self._compact_every
 
-def get_monthly_breakdown(
+    def load(self) -> dict[str, list[VideoEntry]]:
+        """파일에서 다시 로드 (저장 안 된 변경은 버림). 남은 저널이 있으면 반영 후 저장."""
+        raw, self._index = load_history_with_index()
+        self._pending = 0
+        self._has_journal = os.path.exists(JOURNAL_PATH)
+        replayed = _replay_journal(raw, self._index) if self._has_journal else 0
+        self.history = {
+            date_str: [VideoEntry.from_dict(e) for e in entries]
+            for date_str, entries in raw.items()
+        }
+        self._dirty = replayed > 0
+        if replayed:
+            _LOGGER.info("Replayed %d history journal entries", replayed)
+            self.flush()
+        return self.history
+
+    def has_video_id(self, video_id: str) -> bool:
+        return video_id in self._index
+
+    def add_entry(
+        self,
+        video_id: str,
+        title: str,
+        channel: str,
+        thumbnail: str,
+        url: str,
+        duration: str = "N/A",
+        timestamp: datetime | None = None,
+    ) -> None:
+        """항목 추가. 저널 모드면 저널에만 기록, 아니면 buffered() 밖에서 바로 flush."""
+        ts_iso = (timestamp or datetime.now()).isoformat()
+        date_str = ts_iso[:10]
+        entry = VideoEntry.create(video_id, title, channel, thumbnail, url, duration, ts_iso)
+        self.history.setdefault(date_str, []).append(entry)
+        self._index.add(video_id)
+        self._dirty = True
+        if self._compact_every > 1:
+            _append_journal(date_str, entry.as_dict())
+            self._has_journal = True
+            self._pending += 1
+            return
+        if not self._buffer_depth:
+            self.flush()
+
+    def flush(self) -> None:
+        """변경 사항이 있으면 본 파일에 저장하고 저널 정리."""
+        if self._dirty and save_history(self.history):
+            self._dirty = False
+            self._pending = 0
+            if self._has_journal:
+                _remove_journal()
+                self._has_journal = False
+
+    @contextmanager
+    def buffered(self) -> Iterator[HistoryStore]:
+        """블록 안의 add_entry 저장을 모아 종료 시 한 번만 flush."""
+        self._buffer_depth += 1
+        try:
+            yield self
+        finally:
+            self._buffer_depth -= 1
+            if not self._buffer_depth:
+                self.flush()
+
+
+def get_monthly_summary(
     history: dict[str, list[dict[str, Any]]]
 ) -> dict[str, dict[str, int]]:
-    """월별 동영상/쇼츠 구분. { "YYYY-MM": {"videos": n, "shorts": n} } 최신순."""
+    """
+    월별 집계 한 번에 계산.
+    { "YYYY-MM": {"videos": n, "shorts": n, "total": n} } 최신순.
+    """
     monthly: dict[str, dict[str, int]] = {}
     for date_str, entries in history.items():
         if len(date_str) < 7:
             continue
         month = date_str[:7]
-        if month not in monthly:
-            monthly[month] = {"videos": 0, "shorts": 0}
+        bucket = monthly.get(month)
+        if bucket is None:
+            bucket = monthly[month] = {"videos": 0, "shorts": 0, "total": 0}
+        # Shorts 여부: duration 또는 channel로 판별 (항목당 함수 호출 없이 인라인)
+        shorts = 0
         for e in entries:
-            if _is_shorts(e):
-                monthly[month]["shorts"] += 1
-            else:
-                monthly[month]["videos"] += 1
+            get = e.get
+            if get("duration") == "Shorts" or get("channel") == "YouTube Shorts":
+                shorts += 1
+        bucket["shorts"] += shorts
+        bucket["videos"] += len(entries) - shorts
+        bucket["total"] += len(entries)
     return dict(sorted(monthly.items(), reverse=True))
+
+
+def get_monthly_stats(history: dict[str, list[dict[str, Any]]]) -> dict[str, int]:
+    """월별 시청 개수 (전체). { "YYYY-MM": count } 최신순. 하위 호환용."""
+    # 전체 개수만 필요하므로 항목별 Shorts 판별 없이 날짜 리스트 길이만 합산
+    monthly: Counter[str] = Counter()
+    for date_str, entries in history.items():
+        if len(date_str) >= 7:
+            monthly[date_str[:7]] += len(entries)
+    return dict(sorted(monthly.items(), reverse=True))
+
+
+def get_monthly_breakdown(
+    history: dict[str, list[dict[str, Any]]]
+) -> dict[str, dict[str, int]]:
+    """월별 동영상/쇼츠 구분. { "YYYY-MM": {"videos": n, "shorts": n} } 최신순."""
+    return {
+        m: {"videos": v["videos"], "shorts": v["shorts"]}
+        for m, v in get_monthly_summary(history).items()
+    }
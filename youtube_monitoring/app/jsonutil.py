@@ -0,0 +1,75 @@
+"""
+JSON 직렬화 래퍼 - orjson 설치 시 사용, 없으면 stdlib json으로 대체.
+
+- loads: str/bytes 모두 허용
+- dumps: 항상 UTF-8 bytes 반환 (ensure_ascii=False 와 동일하게 한글 그대로 저장)
+- load_file: 1 MiB 버퍼 바이너리 읽기
+- dump_file: 임시 파일에 쓴 뒤 os.replace 로 교체 (쓰기 중 중단돼도 기존 파일 유지)
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable
+
+try:
+    import orjson  # type: ignore
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+# 수 MB 히스토리 파일 읽기/쓰기 시 syscall 횟수 감소 (기본 8 KiB 대신 1 MiB)
+_IO_BUFFER_SIZE = 1 << 20
+
+# orjson.JSONDecodeError 는 json.JSONDecodeError 의 하위 클래스라 하나로 처리 가능
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes | bytearray | str) -> Any:
+    """JSON 파싱."""
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False, default: Callable[[Any], Any] | None = None) -> bytes:
+    """JSON 직렬화 → UTF-8 bytes. 기본은 공백 없는 compact, indent=True 면 2칸 들여쓰기."""
+    if _ORJSON_AVAILABLE:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if default is not None:
+            # stdlib json과 같게 dataclass도 default로 직렬화 (orjson 기본은 필드 전체를 그대로 출력)
+            option |= orjson.OPT_PASSTHROUGH_DATACLASS
+        return orjson.dumps(obj, default=default, option=option)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=default).encode("utf-8")
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=default
+    ).encode("utf-8")
+
+
+def load_file(path: str) -> Any:
+    """path의 JSON을 bytes로 한 번에 읽어 파싱. OSError/JSONDecodeError 전파."""
+    with open(path, "rb", buffering=_IO_BUFFER_SIZE) as f:
+        return loads(f.read())
+
+
+def dump_file(
+    path: str,
+    obj: Any,
+    *,
+    indent: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> None:
+    """obj를 path에 원자적으로 저장. 실패 시 OSError 전파."""
+    data = dumps(obj, indent=indent, default=default)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb", buffering=_IO_BUFFER_SIZE) as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -8,14 +8,18 @@
     "YYYY-MM": { "added": ["채널A"], "removed": ["채널B"] }
   }
 }
+파일은 compact JSON (들여쓰기는 설명용). 확인 시 `python -m json.tool` 사용.
 """
 from __future__ import annotations
 
-import json
 import logging
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
+
+from . import jsonutil
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,7 +27,7 @@ SUBS_FILE = "/data/yt_subscriptions.json"
 FALLBACK_FILE = "yt_subscriptions.json"
 
 
-def _get_subs_path() -> str:
+def _resolve_subs_path() -> str:
     """쓰기 가능한 구독 파일 경로 반환."""
     candidates = [
         SUBS_FILE,
@@ -37,76 +41,171 @@ def _get_subs_path() -> str:
     return os.path.join(os.path.dirname(__file__), "..", FALLBACK_FILE)
 
 
+# 저장 경로는 프로세스 동안 바뀌지 않으므로 import 시 한 번만 결정. 환경변수로 재지정 가능.
+SUBS_PATH = os.environ.get("YT_SUBS_PATH") or _resolve_subs_path()
+
+
+def _lists_to_sets(monthly: dict[str, Any]) -> None:
+    """로드 직후 월별 added/removed list를 set으로 변환 (메모리 내 형식)."""
+    for changes in monthly.values():
+        changes["added"] = set(changes.get("added") or ())
+        changes["removed"] = set(changes.get("removed") or ())
+
+
 def load_subscription_store() -> dict[str, Any]:
-    """구독 저장소 로드."""
-    path = _get_subs_path()
+    """구독 저장소 로드. monthly_changes의 added/removed는 set."""
+    path = SUBS_PATH
     if not os.path.exists(path):
         return {"last_snapshot": None, "monthly_changes": {}}
 
     try:
-        with open(path, encoding="utf-8") as f:
-            data = json.load(f)
+        data = jsonutil.load_file(path)
         if isinstance(data, dict):
+            _lists_to_sets(data.get("monthly_changes") or {})
             return data
         return {"last_snapshot": None, "monthly_changes": {}}
-    except (json.JSONDecodeError, OSError) as err:
+    except (jsonutil.JSONDecodeError, OSError) as err:
         _LOGGER.warning("Failed to load subscription store: %s", err)
         return {"last_snapshot": None, "monthly_changes": {}}
 
 
 def save_subscription_store(store: dict[str, Any]) -> None:
     """구독 저장소 저장."""
-    path = _get_subs_path()
+    path = SUBS_PATH
     dir_path = os.path.dirname(path) or "."
     try:
         os.makedirs(dir_path, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(store, f, ensure_ascii=False, indent=2)
+        # added/removed/channels set은 default로 정렬된 list로 직렬화
+        jsonutil.dump_file(path, store, default=sorted)
     except OSError as err:
         _LOGGER.error("Failed to save subscription store: %s", err)
 
 
-def update_subscription_changes(
-    current_channels: list[dict[str, str]],
-) -> dict[str, dict[str, list[str]]]:
-    """
-    현재 구독 목록과 이전 스냅샷 비교 → 월별 변경 누적 후 저장.
+def _sorted_desc(monthly: dict[str, Any]) -> dict[str, Any]:
+    """월 키 최신순 dict. 이미 정렬돼 있으면 O(M) 확인만 하고 그대로 반환."""
+    keys = list(monthly)
+    if all(a > b for a, b in zip(keys, keys[1:])):
+        return monthly
+    return dict(sorted(monthly.items(), reverse=True))
 
-    current_channels: [{ "channel_name": "..." }, ...]
-    Returns: monthly_changes { "YYYY-MM": { "added": [...], "removed": [...] } }
-    """
-    store = load_subscription_store()
-    current_names = {c.get("channel_name", "").strip() for c in current_channels if c.get("channel_name")}
 
-    last = store.get("last_snapshot")
-    monthly = store.get("monthly_changes", {})
+def _insert_month(monthly: dict[str, Any], month: str) -> dict[str, Any]:
+    """빈 월 항목 추가 후 최신순 dict 반환."""
+    entry: dict[str, set[str]] = {"added": set(), "removed": set()}
+    monthly = _sorted_desc(monthly)
+    if not monthly or month > next(iter(monthly)):
+        return {month: entry, **monthly}
+    monthly[month] = entry
+    return dict(sorted(monthly.items(), reverse=True))
+
 
-    if last and last.get("channels"):
-        prev_names = set(last.get("channels", []))
-        added = list(current_names - prev_names)
-        removed = list(prev_names - current_names)
+class SubscriptionStore:
+    """
+    구독 저장소 메모리 캐시 + 마지막 스냅샷 채널 집합.
+    diff()는 I/O 없이 비교만, 실제 변경이 있을 때만 commit()에서 디스크에 씀.
+    스레드 안전하지 않음 (호출 측에서 잠금).
+    """
 
-        if added or removed:
-            month = datetime.now().strftime("%Y-%m")
+    def __init__(self) -> None:
+        self._store: dict[str, Any] | None = None
+        self._last_set: frozenset[str] = frozenset()
+        self._dirty = False
+
+    def load(self) -> dict[str, Any]:
+        """파일에서 다시 로드."""
+        self._store = load_subscription_store()
+        last = self._store.get("last_snapshot") or {}
+        self._last_set = frozenset(last.get("channels") or ())
+        self._dirty = False
+        return self._store
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """메모리 저장소 (처음 접근 시 로드)."""
+        if self._store is None:
+            return self.load()
+        return self._store
+
+    def diff(self, current_names: set[str] | frozenset[str]) -> tuple[set[str], set[str]]:
+        """마지막 스냅샷 대비 (added, removed). I/O 없음 (load 이후 호출)."""
+        return set(current_names - self._last_set), set(self._last_set - current_names)
+
+    def update(
+        self, current_channels: list[dict[str, str]], *, save: bool = True
+    ) -> dict[str, dict[str, set[str]]]:
+        """현재 구독 목록 반영. 변경이 없으면 저장소/파일을 건드리지 않음."""
+        store = self.data
+        current_names = frozenset(
+            name.strip() for c in current_channels if (name := c.get("channel_name"))
+        )
+        last = store.get("last_snapshot")
+        if last is not None and current_names == self._last_set:
+            return store.get("monthly_changes", {})
+
+        today = datetime.now().isoformat()[:10]  # "YYYY-MM-DD"
+        if last and self._last_set:
+            added, removed = self.diff(current_names)
+            month = today[:7]
+            monthly = store.get("monthly_changes", {})
             if month not in monthly:
-                monthly[month] = {"added": [], "removed": []}
-            existing_added = set(monthly[month]["added"])
-            existing_removed = set(monthly[month]["removed"])
-            monthly[month]["added"] = list(existing_added | set(added))
-            monthly[month]["removed"] = list(existing_removed | set(removed))
-            store["monthly_changes"] = dict(sorted(monthly.items(), reverse=True))
+                # 저장소는 최신순 유지 → 새 달은 보통 맨 앞, 그 외에만 재정렬
+                monthly = _insert_month(monthly, month)
+            monthly[month]["added"] |= added
+            monthly[month]["removed"] |= removed
+            store["monthly_changes"] = monthly
             _LOGGER.info("Subscription changes: +%d -%d in %s", len(added), len(removed), month)
 
-    store["last_snapshot"] = {
-        "date": datetime.now().strftime("%Y-%m-%d"),
-        "channels": list(current_names),
-    }
-    save_subscription_store(store)
-    return store.get("monthly_changes", {})
+        # set 그대로 보관, 저장 시 default=sorted 로 list 직렬화
+        store["last_snapshot"] = {"date": today, "channels": current_names}
+        self._last_set = current_names
+        self._dirty = True
+        if save:
+            self.commit()
+        return store.get("monthly_changes", {})
+
+    def commit(self) -> None:
+        """변경 사항이 있으면 저장."""
+        if self._dirty and self._store is not None:
+            save_subscription_store(self._store)
+            self._dirty = False
+
+
+_STORE = SubscriptionStore()
+
+# batch() 진행 여부 (스레드별). 진행 중이면 update 시 저장을 종료 시점으로 미룸
+_BATCH = threading.local()
+
+
+@contextmanager
+def batch() -> Iterator[SubscriptionStore]:
+    """블록 안의 update_subscription_changes 호출 저장을 종료 시 1회로 묶음."""
+    if getattr(_BATCH, "active", False):
+        yield _STORE
+        return
+    _BATCH.active = True
+    try:
+        yield _STORE
+    finally:
+        _BATCH.active = False
+        _STORE.commit()
+
+
+def update_subscription_changes(
+    current_channels: list[dict[str, str]],
+) -> dict[str, dict[str, set[str]]]:
+    """
+    현재 구독 목록과 이전 스냅샷 비교 → 월별 변경 누적 후 저장 (batch() 안이면 종료 시 저장).
+    변경이 없으면 파일을 쓰지 않음.
+
+    current_channels: [{ "channel_name": "..." }, ...]
+    Returns: monthly_changes { "YYYY-MM": { "added": {...}, "removed": {...} } }
+    """
+    return _STORE.update(current_channels, save=not getattr(_BATCH, "active", False))
 
 
 def get_monthly_subscription_changes() -> dict[str, dict[str, list[str]]]:
     """월별 구독 변경 내역 반환. { "YYYY-MM": { "added": [...], "removed": [...] } } 최신순."""
-    store = load_subscription_store()
-    monthly = store.get("monthly_changes", {})
-    return dict(sorted(monthly.items(), reverse=True))
+    return {
+        month: {"added": sorted(changes["added"]), "removed": sorted(changes["removed"])}
+        for month, changes in _sorted_desc(_STORE.data.get("monthly_changes", {})).items()
+    }
@@ -12,6 +12,32 @@ from http.cookiejar import MozillaCookieJar
 import requests
 
 COOKIES_PATH = os.environ.get("COOKIES_PATH", r"c:\Users\redch\Desktop\youtube_cookies.txt")
+# 모듈 로드 시 한 번만 컴파일. 캡처/DOTALL 없이 할당 마커까지만 매칭 (fetcher와 동일)
+YT_INITIAL_RE = re.compile(r"var ytInitialData\s*=\s*\{")
+YT_INITIAL_RE2 = re.compile(r"ytInitialData\s*=\s*\{")
+TABS_KEY = '"twoColumnBrowseResultsRenderer":{"tabs":'
+
+
+_DECODER = json.JSONDecoder()
+
+
+def find_initial_data(html: str) -> int:
+    """ytInitialData 객체 시작('{') 위치. 없으면 -1. 마커만 매칭 (본문은 raw_decode)."""
+    m = YT_INITIAL_RE.search(html) or YT_INITIAL_RE2.search(html)
+    return m.end() - 1 if m else -1
+
+
+def load_tabs(html: str, start: int) -> list:
+    """
+    start('{')에서 시작하는 ytInitialData의 tabs 배열만 파싱 (나머지 수 MB 서브트리는 건너뜀).
+    키 형태가 다르면 전체 객체를 raw_decode.
+    """
+    idx = html.find(TABS_KEY, start)
+    if idx != -1:
+        tabs, _ = _DECODER.raw_decode(html, idx + len(TABS_KEY))
+        return tabs
+    data, _ = _DECODER.raw_decode(html, start)
+    return data["contents"]["twoColumnBrowseResultsRenderer"]["tabs"]
 
 
 def main():
@@ -30,25 +56,22 @@ def main():
     session.cookies = cookie_jar
 
     print("Fetching https://www.youtube.com/feed/channels ...")
-    r = session.get("https://www.youtube.com/feed/channels", timeout=15)
+    r = session.get("https://www.youtube.com/feed/channels", timeout=15, stream=True)
     if r.status_code != 200:
         print("HTTP", r.status_code)
         sys.exit(1)
 
-    html = r.text
-    match = re.search(r"var ytInitialData\s*=\s*({.*?});", html, re.DOTALL)
-    if not match:
-        match = re.search(r"ytInitialData\s*=\s*({.*?});", html, re.DOTALL)
-    if not match:
+    # r.text는 charset 추정(chardet)을 거치므로 bytes를 UTF-8로 한 번만 디코드
+    html = r.content.decode("utf-8", errors="replace")
+    start = find_initial_data(html)
+    if start == -1:
         print("ytInitialData not found in response")
         sys.exit(1)
 
-    data = json.loads(match.group(1))
-
     # 채널 목록까지 경로 (fetcher와 동일)
     channel_list = None
     try:
-        tabs = data["contents"]["twoColumnBrowseResultsRenderer"]["tabs"]
+        tabs = load_tabs(html, start)
         for tab in tabs:
             if "tabRenderer" not in tab:
                 continue
@@ -70,7 +93,7 @@ def main():
                     break
             if channel_list:
                 break
-    except (KeyError, TypeError) as e:
+    except (KeyError, TypeError, ValueError) as e:
         print("Path error:", e)
         sys.exit(1)
 
@@ -89,18 +112,23 @@ def main():
         print("\n--- channelRenderer top-level keys ---")
         print(list(ch.keys()))
 
-        def key_tree(obj, prefix=""):
-            """재귀적으로 키 경로만 출력 (깊이 3까지, 값은 타입만)."""
+        def key_tree(obj, prefix="", depth=0, seen=None):
+            """재귀적으로 키 경로만 출력 (깊이 3까지, 값은 타입만). 이미 본 dict는 건너뜀."""
             if len(prefix) > 80:
                 return
+            if seen is None:
+                seen = set()
+            if id(obj) in seen:
+                return
+            seen.add(id(obj))
             if isinstance(obj, dict):
                 for k, v in obj.items():
                     path = f"{prefix}.{k}" if prefix else k
-                    if isinstance(v, dict) and path.count(".") < 4:
-                        key_tree(v, path)
-                    elif isinstance(v, list) and v and path.count(".") < 4:
+                    if isinstance(v, dict) and depth < 4:
+                        key_tree(v, path, depth + 1, seen)
+                    elif isinstance(v, list) and v and depth < 4:
                         if isinstance(v[0], dict):
-                            key_tree(v[0], path + "[]")
+                            key_tree(v[0], path + "[]", depth + 1, seen)
                     else:
                         typ = type(v).__name__
                         if isinstance(v, str) and len(v) < 60:
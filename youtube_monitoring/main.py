@@ -2,30 +2,29 @@
 """YouTube Monitoring Add-on - HTTP API (cookie-based history, REST + web UI)."""
 from __future__ import annotations
 
+import functools
+import gzip
+import hashlib
 import json
 import logging
 import os
+import signal
 import sys
 import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
-from typing import Any
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
 
 from zoneinfo import ZoneInfo
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from app import jsonutil
 from app.fetcher import YouTubeHistoryFetcher
-from app.history_store import (
-    load_history,
-    save_history,
-    add_entry,
-    get_monthly_stats,
-    get_monthly_breakdown,
-    has_video_id,
-)
+from app.history_store import HistoryStore, VideoEntry, get_monthly_summary
 from app.subscription_store import (
     update_subscription_changes,
     get_monthly_subscription_changes,
@@ -53,14 +52,22 @@ def _get_log_timezone() -> str:
     return _log_tz_cache
 
 
-def _local_time_converter(timestamp: float | None) -> time.struct_time:
-    """로그 타임스탬프를 로컬 타임존으로 변환."""
-    tz_name = _get_log_timezone()
+_UTC = ZoneInfo("UTC")
+
+
+@functools.lru_cache(maxsize=8)
+def _get_zoneinfo(tz_name: str) -> ZoneInfo:
+    """ZoneInfo 캐시 (tzdata 파싱은 이름당 한 번). 잘못된 이름은 Asia/Seoul."""
     try:
-        tz = ZoneInfo(tz_name)
+        return ZoneInfo(tz_name)
     except Exception:
-        tz = ZoneInfo("Asia/Seoul")
-    dt = datetime.fromtimestamp(timestamp or time.time(), tz=ZoneInfo("UTC")).astimezone(tz)
+        return ZoneInfo("Asia/Seoul")
+
+
+def _local_time_converter(timestamp: float | None) -> time.struct_time:
+    """로그 타임스탬프를 로컬 타임존으로 변환."""
+    tz = _get_zoneinfo(_get_log_timezone())
+    dt = datetime.fromtimestamp(timestamp or time.time(), tz=_UTC).astimezone(tz)
     return dt.timetuple()
 
 
@@ -74,18 +81,74 @@ _handler.setFormatter(_fmt)
 logging.basicConfig(level=logging.INFO, handlers=[_handler])
 _LOGGER = logging.getLogger(__name__)
 
+
+class _TTLSet:
+    """
+    최근 저장한 video_id -> 시각 (중복 저장 방지).
+    add 시 오래된 항목(ttl 경과)이나 maxlen 초과분을 앞에서부터 제거해 크기 유지. 스레드 안전.
+    """
+
+    def __init__(self, maxlen: int = 4096) -> None:
+        self._items: OrderedDict[str, float] = OrderedDict()
+        self._maxlen = maxlen
+        self._lock = threading.Lock()
+
+    def add(self, key: str, ts: float, ttl: float) -> None:
+        with self._lock:
+            items = self._items
+            items[key] = ts
+            items.move_to_end(key)
+            while items:
+                oldest_ts = next(iter(items.values()))
+                if len(items) <= self._maxlen and ts - oldest_ts < ttl:
+                    break
+                items.popitem(last=False)
+
+    def seen_within(self, key: str, window: float, now: float) -> bool:
+        """window초 안에 add된 key인지."""
+        with self._lock:
+            ts = self._items.get(key)
+        return ts is not None and now - ts < window
+
+
 fetcher: YouTubeHistoryFetcher | None = None
 mqtt_pub: MqttPublisher | None = None
 _history_lock = threading.Lock()
+# 히스토리는 시작 시 한 번 로드해 메모리에 유지. 추가분은 저널(jsonl)에 한 줄씩 (재시작 시 복구),
+# 본 파일은 _history_saver가 N건마다 또는 추가가 한동안 없을 때만 다시 씀
+HISTORY_COMPACT_EVERY = 20
+HISTORY_COMPACT_IDLE_SEC = 300  # 마지막 추가 후 이 시간 동안 추가가 없으면 본 파일로 합침
+_history_store = HistoryStore(compact_every=HISTORY_COMPACT_EVERY)
+_save_event = threading.Event()
 _subs_lock = threading.Lock()
+# 핸들러 스레드(ThreadingHTTPServer)와 fetch_loop가 함께 쓰는 상태 보호용
+# (_last_seen_video_id, _last_manual_refresh_recommended, _data_revision)
+_state_lock = threading.Lock()
 _last_seen_video_id: str | None = None
-_recent_added: dict[str, float] = {}  # video_id -> timestamp (5분 내 중복 방지)
+_recent_added = _TTLSet()  # video_id -> timestamp (5분 내 중복 방지)
 _last_recommended_fetch: float = 0  # 추천 영상 마지막 fetch 시각
 _last_manual_refresh_recommended: float = 0  # 수동 새로고침 마지막 시각 (10분 쿨다운)
 _last_subscriptions_fetch: float = 0  # 구독 채널 마지막 fetch (2분 간격, 429 방지)
 _last_published_cookies_valid: bool | None = None  # MQTT 중복 발행 방지
+_history_version = 0  # on_video_change 저장 시 증가 (파생 데이터 캐시 무효화)
+# 구독/월별 구독 변경/추천 영상 반영이 "끝난 뒤" 증가 (/api/history ETag용, _state_lock 보호)
+_data_revision = 0
+_derived_cache: dict[str, Any] = {
+    "version": -1, "filtered": None, "monthly": None, "breakdown": None, "stats_bytes": None,
+}
+# /api/history 응답 (ETag, JSON, gzip). 튜플 통째로 교체
+_history_payload_cache: tuple[str, bytes, bytes | None] | None = None
+# (fetcher.history_version, Shorts 제외 실시간 목록). 튜플 통째로 교체 → 잠금 없이 읽기
+_live_cache: tuple[int, list[dict[str, Any]]] = (-1, [])
 
 REFRESH_COOLDOWN_SEC = 600  # 수동 새로고침 쿨다운 10분
+GZIP_MIN_BYTES = 1024  # 이보다 작은 JSON 응답은 압축하지 않음
+_stop = threading.Event()  # 종료 요청 (SIGTERM) → fetch_loop 대기 즉시 해제
+MAX_INGEST_BYTES = 16 * 1024  # /api/ingest 요청 본문 최대 크기
+# 추천 영상 fetch 중복 방지: 진행 중이면 새로 요청하지 않고 완료 이벤트를 기다림
+_recommended_lock = threading.Lock()
+_recommended_inflight: threading.Event | None = None
+RECOMMENDED_WAIT_SEC = 60  # 진행 중인 fetch 대기 최대 시간
 
 
 def _parse_bool(val: Any) -> bool:
@@ -97,9 +160,13 @@ def _parse_bool(val: Any) -> bool:
     return bool(val)
 
 
-def load_options() -> dict:
-    """에드온 옵션 로드. HA는 /data/options.json, 로컬은 환경변수 사용."""
-    options_path = "/data/options.json"
+OPTIONS_PATH = "/data/options.json"
+
+
+@functools.lru_cache(maxsize=2)
+def _load_options_cached(mtime: float) -> Mapping[str, Any]:
+    """options.json 파싱 결과. mtime이 바뀔 때만 다시 읽음 (읽기 전용 매핑 반환)."""
+    options_path = OPTIONS_PATH
     defaults = {
         "cookies_path": os.environ.get("COOKIES_PATH", "/config/youtube_cookies.txt"),
         "scan_interval": int(os.environ.get("SCAN_INTERVAL", "60")),
@@ -121,7 +188,28 @@ def load_options() -> dict:
     except (json.JSONDecodeError, OSError) as err:
         _LOGGER.warning("Failed to load options.json: %s, using env defaults", err)
 
-    return defaults
+    return MappingProxyType(defaults)
+
+
+# options.json mtime 재확인 간격 (초). 요청마다 stat 하지 않도록 마지막 확인 시각/mtime 보관
+OPTIONS_RECHECK_SEC = 5
+_options_checked: list[float] = [float("-inf"), 0.0]  # [확인 시각(monotonic), mtime]
+
+
+def load_options() -> Mapping[str, Any]:
+    """
+    에드온 옵션 로드. HA는 /data/options.json, 로컬은 환경변수 사용. 파일 mtime 기준 캐시.
+    mtime은 OPTIONS_RECHECK_SEC마다 한 번만 확인 (그 사이 호출은 I/O 없음).
+    """
+    now = time.monotonic()
+    checked_at, mtime = _options_checked
+    if now - checked_at >= OPTIONS_RECHECK_SEC:
+        try:
+            mtime = os.stat(OPTIONS_PATH).st_mtime
+        except OSError:
+            mtime = 0.0
+        _options_checked[:] = (now, mtime)
+    return _load_options_cached(mtime)
 
 
 def _is_shorts(video_data: dict) -> bool:
@@ -136,64 +224,185 @@ def _is_shorts(video_data: dict) -> bool:
     return False
 
 
-def _filter_shorts_from_history(history: dict) -> dict:
-    """Shorts 항목을 제거한 히스토리 복사본 (통계/표시용)."""
+def _filter_shorts_from_history(history: dict[str, list[VideoEntry]]) -> dict:
+    """Shorts 항목을 제거한 히스토리 복사본 (통계/표시용). 날짜별 최신순."""
+    # is_shorts는 VideoEntry 생성 시 미리 계산됨: 한 번의 순회로 필터 + 빈 날짜 제외 + dict 변환
     filtered: dict[str, list] = {}
     for date_str, entries in history.items():
-        filtered[date_str] = [e for e in entries if not _is_shorts(e)]
-    return {k: v for k, v in filtered.items() if v}
+        kept = [e.as_dict() for e in reversed(entries) if not e.is_shorts]
+        if kept:
+            filtered[date_str] = kept
+    return filtered
 
 
-def _now_in_user_tz() -> datetime:
-    """설정된 timezone 기준 현재 시각 (시청 기록 날짜용)."""
-    opts = load_options()
-    tz_name = opts.get("timezone", "Asia/Seoul")
-    try:
-        tz = ZoneInfo(tz_name)
-    except Exception:
-        tz = ZoneInfo("Asia/Seoul")
-    return datetime.now(tz)
+def _split_monthly_summary(summary: dict) -> tuple[dict, dict]:
+    """get_monthly_summary 결과를 (monthly_stats, monthly_breakdown) API 형식으로 분리."""
+    monthly = {m: v["total"] for m, v in summary.items()}
+    breakdown = {m: {"videos": v["videos"], "shorts": v["shorts"]} for m, v in summary.items()}
+    return monthly, breakdown
 
 
-def on_video_change(video_data: dict) -> bool:
+def _now_in_user_tz(tz_name: str | None = None) -> datetime:
+    """설정된 timezone 기준 현재 시각 (시청 기록 날짜용). tz_name 없으면 옵션에서 조회."""
+    if tz_name is None:
+        tz_name = load_options().get("timezone", "Asia/Seoul")
+    return datetime.now(_get_zoneinfo(tz_name))
+
+
+def on_video_change(video_data: dict, tz_name: str | None = None) -> bool:
     """
-    video_id 변경 시 yt_history.json에 추가.
-    Shorts는 기록하지 않음.
+    video_id 변경 시 메모리 히스토리에 추가 (저널 기록, yt_history.json 합치기는 _history_saver).
+    Shorts는 기록하지 않음. tz_name은 호출 측이 미리 읽어둔 옵션 값 (없으면 조회).
     Returns: True=저장됨, False=중복/Shorts/유효하지 않음.
     """
+    global _history_version
     if _is_shorts(video_data):
         return False
     with _history_lock:
-        history = load_history()
         vid = video_data.get("video_id")
 
         if not vid or vid == "N/A":
             return False
-        if has_video_id(history, vid):
+        if _history_store.has_video_id(vid):
             return False
 
-        add_entry(
-            history,
+        _history_store.add_entry(
             video_id=video_data["video_id"],
             title=video_data.get("title", "N/A"),
             channel=video_data.get("channel", "N/A"),
             thumbnail=video_data.get("thumbnail", ""),
             url=video_data.get("url", ""),
             duration=video_data.get("duration", "N/A"),
-            timestamp=_now_in_user_tz(),
+            timestamp=_now_in_user_tz(tz_name),
         )
-        save_history(history)
+        _history_version += 1
+        _request_save()
         _LOGGER.info("[기록] 저장: %s", video_data.get("title", video_data.get("video_id")))
         return True
 
 
+def _cooldown_status(now: float) -> tuple[int, int]:
+    """수동 새로고침 쿨다운 (retry_after 초, available_at epoch 초). 0초 남음이면 새로고침 가능."""
+    remaining = REFRESH_COOLDOWN_SEC - (now - _last_manual_refresh_recommended)
+    if remaining < 0:
+        remaining = 0
+    return int(remaining), int(now + remaining)
+
+
+def _bump_data_revision() -> None:
+    """구독/추천 데이터 반영 완료 후 호출 → /api/history ETag 갱신."""
+    global _data_revision
+    with _state_lock:
+        _data_revision += 1
+
+
+def _fetch_recommended_shared() -> None:
+    """추천 영상 fetch. 이미 진행 중이면 새로 요청하지 않고 그 fetch 완료를 기다림 (N 요청 → 1 fetch)."""
+    global _recommended_inflight
+    with _recommended_lock:
+        inflight = _recommended_inflight
+        owner = inflight is None
+        if owner:
+            inflight = _recommended_inflight = threading.Event()
+    if not owner:
+        inflight.wait(RECOMMENDED_WAIT_SEC)
+        return
+    before = fetcher.recommended_data
+    try:
+        fetcher.fetch_recommended()
+    finally:
+        if fetcher.recommended_data != before:
+            _bump_data_revision()  # recommended_data 교체 후 (대기 중인 요청 깨우기 전)
+        with _recommended_lock:
+            _recommended_inflight = None
+        inflight.set()
+
+
+def _request_save() -> None:
+    """항목 추가 알림 (_history_saver 스레드가 본 파일 합치기 여부 판단)."""
+    _save_event.set()
+
+
+def _history_saver() -> None:
+    """
+    백그라운드: 저널 미반영 항목이 HISTORY_COMPACT_EVERY개 쌓였거나
+    HISTORY_COMPACT_IDLE_SEC 동안 추가가 없을 때만 본 파일로 합침 (그 사이 내구성은 저널이 보장).
+    """
+    while True:
+        added = _save_event.wait(HISTORY_COMPACT_IDLE_SEC)
+        _save_event.clear()
+        try:
+            with _history_lock:
+                if added and not _history_store.needs_compact:
+                    continue
+                _history_store.flush()  # 변경 없으면 아무것도 안 함
+        except Exception as err:
+            _LOGGER.error("[기록] 저장 오류: %s", err)
+
+
+def _refresh_derived_locked() -> dict[str, Any]:
+    """_history_lock 보유 상태에서 호출. 히스토리 버전이 바뀌었으면 파생 데이터 재계산."""
+    if _derived_cache["version"] != _history_version:
+        filtered = _filter_shorts_from_history(_history_store.history)
+        monthly, breakdown = _split_monthly_summary(get_monthly_summary(filtered))
+        _derived_cache.update(
+            version=_history_version, filtered=filtered, monthly=monthly, breakdown=breakdown,
+            stats_bytes=None,
+        )
+    return _derived_cache
+
+
+def _get_derived_history() -> tuple[dict, dict, dict]:
+    """
+    (Shorts 제외 히스토리, monthly_stats, monthly_breakdown).
+    히스토리가 바뀌었을 때(_history_version)만 다시 계산, 그 외에는 캐시 반환 (읽기 전용으로 사용).
+    """
+    with _history_lock:
+        cache = _refresh_derived_locked()
+        return cache["filtered"], cache["monthly"], cache["breakdown"]
+
+
+def _gzip_json(payload: bytes) -> bytes | None:
+    """GZIP_MIN_BYTES 이상이면 gzip 압축본, 작으면 None (압축 이득보다 비용이 큼)."""
+    if len(payload) < GZIP_MIN_BYTES:
+        return None
+    return gzip.compress(payload, compresslevel=6)
+
+
+def _get_stats_bytes() -> tuple[bytes, bytes | None]:
+    """/api/stats 응답 (JSON, gzip). 히스토리 버전이 같으면 직렬화/압축 결과 재사용."""
+    with _history_lock:
+        cache = _refresh_derived_locked()
+        if cache["stats_bytes"] is None:
+            payload = jsonutil.dumps({
+                "monthly_stats": cache["monthly"],
+                "monthly_breakdown": cache["breakdown"],
+            })
+            cache["stats_bytes"] = (payload, _gzip_json(payload))
+        return cache["stats_bytes"]
+
+
+def _get_live_videos() -> list[dict[str, Any]]:
+    """실시간 시청 기록 (Shorts 제외). fetcher.history_data가 새로 할당됐을 때만 다시 분류."""
+    global _live_cache
+    if not fetcher:
+        return []
+    version, videos = _live_cache
+    if version != fetcher.history_version:
+        version = fetcher.history_version
+        videos = [v for v in fetcher.history_data or () if not _is_shorts(v)]
+        _live_cache = (version, videos)
+    return videos
+
+
 def fetch_loop() -> None:
     """
     백그라운드 루프: YouTube 시청 기록 폴링 + video_id 변경 시 저장.
-    시청 기록: 매 루프. 구독 채널: 2분 간격. 추천 영상: 60초 간격 (옵션).
-    429 rate limit 방지를 위해 요청 간격 조절.
+    시청 기록: scan_interval (새 영상 없으면 간격을 최대 4배까지 늘림). 구독 채널: 2분 간격. 추천 영상: 옵션 간격.
+    작업별 다음 실행 시각(monotonic)을 두고 가장 가까운 시각까지 _stop.wait → 간격이 밀리지 않고 종료 시 즉시 반환.
+    429 rate limit 방지를 위해 요청 간 2초 간격 유지.
     """
-    global fetcher, _last_seen_video_id, _recent_added, _last_recommended_fetch, _last_subscriptions_fetch, _last_published_cookies_valid
+    global fetcher, _last_seen_video_id, _last_recommended_fetch, _last_subscriptions_fetch, _last_published_cookies_valid
     if not fetcher:
         return
 
@@ -203,83 +412,155 @@ def fetch_loop() -> None:
     recommended_interval = opts.get("scan_interval_recommended", 600)
     subscriptions_interval = 120  # 구독 채널 2분 간격 (429 방지)
     fetch_recommended = opts.get("fetch_recommended", True)
+    tz_name = opts.get("timezone", "Asia/Seoul")
+    # 새 영상이 없으면 폴링 간격을 두 배씩 늘림 (최대 4배), 새 영상 발견 시 원래 간격으로
+    max_interval = interval * 4
+    current_interval = interval
 
-    while True:
-        try:
-            now = time.time()
-            fetcher.fetch_history()
-            time.sleep(2)  # 요청 간 2초 대기 (429 방지)
+    # 시작 시(main) 이미 조회한 항목은 남은 간격만큼 뒤로
+    start, wall = time.monotonic(), time.time()
+    next_history_at = start
+    next_subs_at = start + max(0, subscriptions_interval - (wall - _last_subscriptions_fetch))
+    next_recommended_at = start + max(0, recommended_interval - (wall - _last_recommended_fetch))
 
-            if now - _last_subscriptions_fetch >= subscriptions_interval:
+    while not _stop.is_set():
+        try:
+            mono = time.monotonic()
+            if mono >= next_history_at:
+                # 예외가 나도 같은 작업을 바로 반복하지 않도록 먼저 다음 시각 지정
+                next_history_at = mono + current_interval
+                with _state_lock:
+                    since = _last_seen_video_id
+                delta = fetcher.fetch_history_delta(since)
+                videos = fetcher.history_data or []
+
+                # delta: 마지막으로 본 영상 이후 새 항목 (최신순) → 오래된 것부터 저장
+                new_ids = False
+                now = time.time()
+                for item in reversed(delta):
+                    video_id = item.get("video_id")
+                    if not video_id or video_id == "N/A":
+                        continue
+                    if not _recent_added.seen_within(video_id, duplicate_sec, now):
+                        if on_video_change(item, tz_name):
+                            _recent_added.add(video_id, now, duplicate_sec * 2)
+                    with _state_lock:
+                        _last_seen_video_id = video_id
+                    new_ids = True
+                if new_ids:
+                    current_interval = interval
+                    # 최근 시청 영상 변경 → MQTT 발행
+                    if mqtt_pub and mqtt_pub.is_connected():
+                        mqtt_pub.publish_recent_watched(videos)
+                else:
+                    current_interval = min(current_interval * 2, max_interval)
+                next_history_at = mono + current_interval
+
+                if not fetcher.cookies_valid:
+                    _LOGGER.warning("[폴링] 쿠키 무효 | 시청 기록/구독 조회 불가, 쿠키 파일 갱신 필요")
+                else:
+                    _LOGGER.debug("[폴링] 시청 기록 %d건 조회", len(videos))
+                if _stop.wait(2):  # 요청 간 2초 대기 (429 방지)
+                    return
+
+            mono = time.monotonic()
+            if mono >= next_subs_at:
+                next_subs_at = mono + subscriptions_interval
+                before = fetcher.subscriptions_data
                 fetcher.fetch_subscriptions()
                 _last_subscriptions_fetch = time.time()
                 sub_data = fetcher.subscriptions_data
-                if sub_data and sub_data.get("channels"):
-                    with _subs_lock:
-                        update_subscription_changes(sub_data["channels"])
-                time.sleep(2)
-
-            if fetch_recommended:
-                if now - _last_recommended_fetch >= recommended_interval:
-                    fetcher.fetch_recommended()
-                    _last_recommended_fetch = now
-                    # MQTT 추천 영상 발행
-                    if mqtt_pub and mqtt_pub.is_connected():
-                        mqtt_pub.publish_recommended(fetcher.recommended_data or [])
+                if sub_data != before:  # 같은 목록이면 월별 변경도 그대로 → ETag 유지
+                    if sub_data and sub_data.get("channels"):
+                        with _subs_lock:
+                            update_subscription_changes(sub_data["channels"])
+                    _bump_data_revision()  # subscriptions_data + 월별 변경 반영 후
+                if _stop.wait(2):
+                    return
+
+            mono = time.monotonic()
+            if fetch_recommended and mono >= next_recommended_at:
+                next_recommended_at = mono + recommended_interval
+                _fetch_recommended_shared()
+                _last_recommended_fetch = time.time()
+                # MQTT 추천 영상 발행
+                if mqtt_pub and mqtt_pub.is_connected():
+                    mqtt_pub.publish_recommended(fetcher.recommended_data or [])
+                if _stop.wait(2):
+                    return
 
             # 쿠키 유효성 변화 시에만 MQTT 발행 (트래픽 최소화)
             if mqtt_pub and mqtt_pub.is_connected():
                 if fetcher.cookies_valid != _last_published_cookies_valid:
                     mqtt_pub.publish_cookies_valid(fetcher.cookies_valid)
                     _last_published_cookies_valid = fetcher.cookies_valid
-
-            videos = fetcher.history_data or []
-
-            if videos:
-                most_recent = videos[0]
-                video_id = most_recent.get("video_id")
-                if video_id and video_id != "N/A":
-                    now = time.time()
-                    if video_id != _last_seen_video_id:
-                        last_added = _recent_added.get(video_id, 0)
-                        if now - last_added >= duplicate_sec:
-                            if on_video_change(most_recent):
-                                _recent_added[video_id] = now
-                        _last_seen_video_id = video_id
-                        # 최근 시청 영상 변경 → MQTT 발행
-                        if mqtt_pub and mqtt_pub.is_connected():
-                            mqtt_pub.publish_recent_watched(videos)
-                    _recent_added = {k: v for k, v in _recent_added.items() if now - v < duplicate_sec * 2}
-
-            if not fetcher.cookies_valid:
-                _LOGGER.warning("[폴링] 쿠키 무효 | 시청 기록/구독 조회 불가, 쿠키 파일 갱신 필요")
-            else:
-                _LOGGER.debug("[폴링] 시청 기록 %d건 조회", len(videos))
         except Exception as err:
             _LOGGER.error("[폴링] 오류: %s", err)
-        time.sleep(interval)
+
+        deadline = min(next_history_at, next_subs_at)
+        if fetch_recommended:
+            deadline = min(deadline, next_recommended_at)
+        if _stop.wait(max(0.0, deadline - time.monotonic())):
+            return
 
 
 class YouTubeMonitoringHandler(BaseHTTPRequestHandler):
-    """HTTP 요청 핸들러: REST API + 웹 UI."""
+    """HTTP 요청 핸들러: REST API + 웹 UI. HTTP/1.1 keep-alive (모든 응답에 Content-Length)."""
+
+    protocol_version = "HTTP/1.1"
+    timeout = 30  # 유휴 keep-alive 연결이 스레드를 계속 점유하지 않도록
 
     def log_message(self, format, *args):
         _LOGGER.debug("%s - %s", self.address_string(), format % args)
 
     def send_json(self, data: dict, status: int = 200) -> None:
-        """JSON 응답 전송 (CORS 포함)."""
+        """JSON 응답 전송 (CORS 포함). orjson 사용 가능 시 bytes로 바로 직렬화."""
+        self.send_json_bytes(jsonutil.dumps(data), status)
+
+    def accepts_gzip(self) -> bool:
+        return "gzip" in self.headers.get("Accept-Encoding", "")
+
+    def send_json_bytes(
+        self,
+        payload: bytes,
+        status: int = 200,
+        headers: dict[str, str] | None = None,
+        gzipped: bytes | None = None,
+    ) -> None:
+        """
+        이미 직렬화된 JSON 바이트 전송 (CORS 포함).
+        gzipped(payload의 gzip 압축본)가 있고 클라이언트가 gzip을 받으면 압축본 전송.
+        """
+        use_gzip = gzipped is not None and self.accepts_gzip()
+        body = gzipped if use_gzip else payload
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
         self.send_header("Access-Control-Allow-Origin", "*")
+        if gzipped is not None or len(payload) >= GZIP_MIN_BYTES:
+            self.send_header("Vary", "Accept-Encoding")  # 압축 대상 크기면 인코딩별로 응답이 다름
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_not_modified(self, etag: str) -> None:
+        """304 응답 (본문 없음, keep-alive 유지)."""
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0")
         self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False).encode("utf-8"))
 
     def send_html(self, html: str, status: int = 200) -> None:
         """HTML 응답 전송."""
+        body = html.encode("utf-8")
         self.send_response(status)
         self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        self.wfile.write(html.encode("utf-8"))
+        self.wfile.write(body)
 
     def do_OPTIONS(self) -> None:
         """CORS preflight (POST /api/ingest용)."""
@@ -287,30 +568,53 @@ class YouTubeMonitoringHandler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
+    def _dispatch(self, routes: dict[str, Callable[[YouTubeMonitoringHandler, str], None]]) -> None:
+        """경로로 핸들러 조회 후 호출. 쿼리 문자열은 그대로 넘기고 필요한 핸들러만 parse_qs."""
+        raw = self.path
+        q = raw.find("?")
+        path = (raw[:q] if q >= 0 else raw).rstrip("/") or "/"
+        handler = routes.get(path)
+        if handler is None:
+            self.close_connection = True  # 읽지 않은 요청 본문이 남아 있을 수 있음
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        handler(self, raw[q + 1:] if q >= 0 else "")
+
     def do_POST(self) -> None:
         """POST /api/ingest, POST /api/refresh/recommended."""
-        parsed = urlparse(self.path)
-        path = parsed.path.rstrip("/") or "/"
-        if path == "/api/ingest":
-            self._handle_ingest()
-            return
-        if path == "/api/refresh/recommended":
-            self._handle_refresh_recommended()
-            return
-        self.send_response(404)
-        self.end_headers()
+        self._dispatch(_POST_ROUTES)
 
-    def _handle_ingest(self) -> None:
-        """실시간 video_id 수신 → yt_history.json에 즉시 저장."""
-        global _last_seen_video_id, _recent_added
+    def _handle_ingest(self, query: str = "") -> None:
+        """
+        실시간 video_id 수신 → 메모리 히스토리에 추가 (파일 저장은 _history_saver).
+        성공 경로는 캐시된 옵션 + 메모리 인덱스만 사용 (파일 읽기/쓰기 없음).
+        """
+        global _last_seen_video_id
 
-        content_len = int(self.headers.get("Content-Length", 0))
         try:
-            body = self.rfile.read(content_len).decode("utf-8")
-            data = json.loads(body) if body else {}
-        except (json.JSONDecodeError, ValueError):
+            content_len = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            content_len = -1
+        if content_len < 0:
+            self.close_connection = True  # 본문 길이를 알 수 없으므로 연결 재사용 불가
+            self.send_json({"error": "Invalid Content-Length"}, status=400)
+            return
+        if content_len > MAX_INGEST_BYTES:
+            self.close_connection = True  # 본문을 읽지 않았으므로 연결 재사용 불가
+            self.send_json({"error": "too large"}, status=413)
+            return
+        try:
+            body = self.rfile.read(content_len)
+            data = jsonutil.loads(body) if body else {}
+        except ValueError:  # JSONDecodeError, UnicodeDecodeError 포함
+            self.send_json({"error": "Invalid JSON"}, status=400)
+            return
+        if not isinstance(data, dict):
             self.send_json({"error": "Invalid JSON"}, status=400)
             return
 
@@ -322,7 +626,10 @@ class YouTubeMonitoringHandler(BaseHTTPRequestHandler):
         opts = load_options()
         duplicate_sec = opts.get("duplicate_minutes", 5) * 60
         now = time.time()
-        if now - _recent_added.get(video_id, 0) < duplicate_sec:
+        if _recent_added.seen_within(video_id, duplicate_sec, now):
+            self.send_json({"status": "skipped", "reason": "duplicate"})
+            return
+        if _history_store.has_video_id(video_id):  # 잠금 없이 dict 조회 (on_video_change에서 재확인)
             self.send_json({"status": "skipped", "reason": "duplicate"})
             return
 
@@ -338,32 +645,47 @@ class YouTubeMonitoringHandler(BaseHTTPRequestHandler):
             "url": url,
             "duration": data.get("duration", "N/A"),
         }
-        if not on_video_change(video_data):
+        if not on_video_change(video_data, opts.get("timezone", "Asia/Seoul")):
             self.send_json({"status": "skipped", "reason": "duplicate"})
             return
 
-        _last_seen_video_id = video_id
-        _recent_added[video_id] = now
+        with _state_lock:
+            _last_seen_video_id = video_id
+        _recent_added.add(video_id, now, duplicate_sec * 2)
         self.send_json({"status": "ok", "video_id": video_id})
 
-    def _handle_refresh_recommended(self) -> None:
+    def _handle_refresh_recommended(self, query: str = "") -> None:
         """수동 추천 영상 새로고침. 10분 쿨다운."""
         global fetcher, _last_manual_refresh_recommended
+        if self.headers.get("Content-Length", "0") != "0":
+            self.close_connection = True  # 본문은 읽지 않으므로 연결 재사용 불가
+        if not fetcher:
+            self.send_json({"error": "fetcher not ready"}, status=503)
+            return
+        inflight = _recommended_inflight
+        if inflight is not None:
+            # 이미 진행 중인 fetch에 합류 → 완료 후 같은 결과 반환 (추가 요청 없음)
+            inflight.wait(RECOMMENDED_WAIT_SEC)
+            self.send_json({
+                "status": "ok",
+                "recommended": fetcher.recommended_data or [],
+                "next_refresh_at": int(_last_manual_refresh_recommended + REFRESH_COOLDOWN_SEC),
+            })
+            return
         now = time.time()
-        elapsed = now - _last_manual_refresh_recommended
-        if elapsed < REFRESH_COOLDOWN_SEC:
-            retry_after = int(REFRESH_COOLDOWN_SEC - elapsed)
+        with _state_lock:
+            retry_after, _ = _cooldown_status(now)
+            if not retry_after:
+                # 동시 요청이 함께 통과하지 않도록 fetch 전에 시각 선점
+                _last_manual_refresh_recommended = now
+        if retry_after:
             self.send_json({
                 "error": "cooldown",
                 "retry_after": retry_after,
                 "message": f"{retry_after}초 후 다시 시도하세요.",
             }, status=429)
             return
-        if not fetcher:
-            self.send_json({"error": "fetcher not ready"}, status=503)
-            return
-        fetcher.fetch_recommended()
-        _last_manual_refresh_recommended = now
+        _fetch_recommended_shared()
         self.send_json({
             "status": "ok",
             "recommended": fetcher.recommended_data or [],
@@ -372,54 +694,60 @@ class YouTubeMonitoringHandler(BaseHTTPRequestHandler):
 
     def do_GET(self) -> None:
         """GET 라우팅: /, /api/history, /api/stats, /api/health."""
-        global fetcher
-        parsed = urlparse(self.path)
-        path = parsed.path.rstrip("/") or "/"
-        query = parse_qs(parsed.query)
+        self._dispatch(_GET_ROUTES)
 
-        if path == "/" or path == "/index.html":
-            self._serve_ui()
-            return
-        if path == "/api/history" or path == "/history":
-            self._serve_history(query)
-            return
-        if path == "/api/stats":
-            self._serve_stats()
-            return
-        if path == "/api/health":
-            self.send_json({
-                "status": "ok",
-                "cookies_valid": fetcher.cookies_valid if fetcher else False,
-            })
+    def _serve_health(self, query: str = "") -> None:
+        """헬스 체크."""
+        self.send_json({
+            "status": "ok",
+            "cookies_valid": fetcher.cookies_valid if fetcher else False,
+        })
+
+    def _serve_history(self, query: str = "") -> None:
+        """
+        누적 기록(yt_history.json) + 실시간 조회(fetcher) 병합 응답. Shorts 제외.
+        응답을 구성하는 데이터 버전으로 ETag 생성, If-None-Match 일치 시 304 (직렬화 생략).
+        버전은 데이터 반영이 끝난 뒤 올라가므로 fetch 도중 만든 응답이 최종 ETag로 캐시되지 않음.
+        직렬화/압축 결과는 ETag별로 한 번만 만들어 여러 클라이언트가 재사용.
+        (쿨다운 값은 만든 시점 기준 — UI는 절대 시각 recommended_refresh_available_at 사용)
+        """
+        global fetcher, _history_payload_cache
+        opts = load_options()
+        with _state_lock:
+            data_revision = _data_revision
+            manual_refresh_at = _last_manual_refresh_recommended  # 응답의 쿨다운 값 기준
+        etag = 'W/"%d-%d-%d-%d-%d-%d"' % (
+            _history_version,
+            fetcher.history_version if fetcher else 0,
+            int(fetcher.cookies_valid) if fetcher else 0,
+            data_revision,
+            int(manual_refresh_at),
+            int(bool(opts.get("fetch_recommended", True))),
+        )
+        if self.headers.get("If-None-Match") == etag:
+            self.send_not_modified(etag)
             return
-        self.send_response(404)
-        self.end_headers()
 
-    def _serve_history(self, query: dict) -> None:
-        """누적 기록(yt_history.json) + 실시간 조회(fetcher) 병합 응답. Shorts 제외."""
-        global fetcher, _last_manual_refresh_recommended
-        with _history_lock:
-            accumulated = load_history()
+        cached = _history_payload_cache
+        if cached is None or cached[0] != etag:
+            payload = self._build_history_payload(opts)
+            cached = _history_payload_cache = (etag, payload, _gzip_json(payload))
+        self.send_json_bytes(cached[1], headers={"ETag": etag}, gzipped=cached[2])
 
-        accumulated = _filter_shorts_from_history(accumulated)
-        live_videos = fetcher.history_data if (fetcher and fetcher.history_data) else []
-        live_videos = [v for v in live_videos if not _is_shorts(v)]
-        by_date: dict[str, list] = dict(accumulated)
-        monthly = get_monthly_stats(accumulated)
-        monthly_breakdown = get_monthly_breakdown(accumulated)
+    @staticmethod
+    def _build_history_payload(opts: Mapping[str, Any]) -> bytes:
+        """/api/history 응답 JSON 바이트 생성."""
+        accumulated, monthly, monthly_breakdown = _get_derived_history()
+        live_videos = _get_live_videos()
 
-        opts = load_options()
         with _subs_lock:
             monthly_subs = get_monthly_subscription_changes()
 
-        now = time.time()
-        elapsed = now - _last_manual_refresh_recommended
-        recommended_refresh_available_at = int(now + max(0, REFRESH_COOLDOWN_SEC - elapsed))
-        recommended_refresh_retry_after = int(max(0, REFRESH_COOLDOWN_SEC - elapsed))
+        recommended_refresh_retry_after, recommended_refresh_available_at = _cooldown_status(time.time())
 
-        self.send_json({
+        return jsonutil.dumps({
             "cookies_valid": fetcher.cookies_valid if fetcher else False,
-            "by_date": by_date,
+            "by_date": accumulated,
             "monthly_stats": monthly,
             "monthly_breakdown": monthly_breakdown,
             "live": live_videos,
@@ -431,22 +759,43 @@ class YouTubeMonitoringHandler(BaseHTTPRequestHandler):
             "recommended_refresh_retry_after": recommended_refresh_retry_after,
         })
 
-    def _serve_stats(self) -> None:
+    def _serve_stats(self, query: str = "") -> None:
         """월별 통계 반환 (Shorts 제외)."""
-        with _history_lock:
-            history = load_history()
-        history = _filter_shorts_from_history(history)
-        monthly = get_monthly_stats(history)
-        monthly_breakdown = get_monthly_breakdown(history)
-        self.send_json({
-            "monthly_stats": monthly,
-            "monthly_breakdown": monthly_breakdown,
-        })
+        payload, gzipped = _get_stats_bytes()
+        self.send_json_bytes(payload, gzipped=gzipped)
+
+    def _serve_ui(self, query: str = "") -> None:
+        """웹 UI HTML 응답. 미리 인코딩/압축한 바이트 사용, ETag 일치 시 304."""
+        if self.headers.get("If-None-Match") == _UI_HTML_ETAG:
+            self.send_not_modified(_UI_HTML_ETAG)
+            return
+        use_gzip = self.accepts_gzip()
+        body, length = _UI_BODY_GZIP if use_gzip else _UI_BODY_PLAIN
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", length)
+        self.send_header("ETag", _UI_HTML_ETAG)
+        self.send_header("Cache-Control", _UI_CACHE_CONTROL)
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
 
-    def _serve_ui(self) -> None:
-        """웹 UI HTML 응답."""
-        html = _get_ui_html()
-        self.send_html(html)
+# 경로 -> 핸들러 (rstrip("/") 적용된 경로 기준)
+_GET_ROUTES: dict[str, Callable[[YouTubeMonitoringHandler, str], None]] = {
+    "/": YouTubeMonitoringHandler._serve_ui,
+    "/index.html": YouTubeMonitoringHandler._serve_ui,
+    "/api/history": YouTubeMonitoringHandler._serve_history,
+    "/history": YouTubeMonitoringHandler._serve_history,
+    "/api/stats": YouTubeMonitoringHandler._serve_stats,
+    "/api/health": YouTubeMonitoringHandler._serve_health,
+}
+_POST_ROUTES: dict[str, Callable[[YouTubeMonitoringHandler, str], None]] = {
+    "/api/ingest": YouTubeMonitoringHandler._handle_ingest,
+    "/api/refresh/recommended": YouTubeMonitoringHandler._handle_refresh_recommended,
+}
 
 
 def _get_ui_html() -> str:
@@ -495,6 +844,9 @@ def _get_ui_html() -> str:
         .video .meta { color: var(--ha-text-secondary); font-size: 0.85em; margin-top: 4px; }
         .video a { color: var(--ha-primary); text-decoration: none; }
         .video a:hover { text-decoration: underline; }
+        /* 긴 목록: 화면 밖 항목은 레이아웃/페인트 생략 (크기는 예상값으로 자리만 차지) */
+        .channel-item { content-visibility: auto; contain-intrinsic-size: auto 80px; }
+        #recommended-content .video { content-visibility: auto; contain-intrinsic-size: auto 92px; }
         .status { padding: 8px 12px; border-radius: 6px; margin-bottom: 16px; font-size: 0.9rem; }
         .status.ok { background: rgba(0,200,83,0.2); color: #4caf50; }
         .status.error { background: rgba(244,67,54,0.2); color: #f44336; }
@@ -574,24 +926,88 @@ def _get_ui_html() -> str:
         </div>
     </div>
 
+    <!-- 일별 목록 렌더링용 템플릿 (clone 후 textContent로 채움) -->
+    <template id="tpl-date">
+        <div class="date-group">
+            <div class="date-header">
+                <span class="date"></span>
+                <span class="count"></span>
+                <span class="chevron">▼</span>
+            </div>
+            <div class="date-content"></div>
+        </div>
+    </template>
+    <template id="tpl-video">
+        <a target="_blank" class="video" style="text-decoration:none;color:inherit;">
+            <img alt="" width="120" height="68" loading="lazy" decoding="async">
+            <div class="info">
+                <div class="title"></div>
+                <div class="channel"></div>
+                <div class="meta"></div>
+            </div>
+        </a>
+    </template>
+    <template id="tpl-recommended">
+        <a target="_blank" class="video" style="text-decoration:none; color:inherit; display:block; margin-bottom:12px;">
+            <img alt="" width="120" height="68" loading="lazy" decoding="async">
+            <div class="info">
+                <div class="title"></div>
+                <div class="channel"></div>
+                <div class="meta"></div>
+            </div>
+        </a>
+    </template>
+    <template id="tpl-channel-row">
+        <a target="_blank" class="video channel-item" style="text-decoration:none; color:inherit; cursor:pointer;">
+            <img alt="" width="56" height="56" loading="lazy" decoding="async" style="width:56px; height:56px; object-fit:cover; border-radius:50%; flex-shrink:0;">
+            <div class="info" style="flex:1; min-width:0;">
+                <div class="title"></div>
+                <div class="channel-meta" style="color:var(--ha-text-secondary); font-size:0.85em;"></div>
+                <div class="channel-desc" style="color:var(--ha-text-secondary); font-size:0.8em; margin-top:2px; white-space:nowrap; overflow:hidden; text-overflow:ellipsis;"></div>
+            </div>
+        </a>
+    </template>
+
     <script>
         let historyData = { by_date: {}, monthly_stats: {}, monthly_breakdown: {}, subscriptions: null, monthly_subscription_changes: {}, recommended: null, fetch_recommended: true, recommended_refresh_available_at: 0, recommended_refresh_retry_after: 0 };
+        // API 기본 경로 (Ingress 하위 경로 대응)와 자주 쓰는 요소는 한 번만 조회
+        const API_BASE = window.location.pathname.endsWith('/') ? window.location.pathname : window.location.pathname + '/';
+        const subscriptionsEl = document.getElementById('subscriptions-content');
+        const monthlySubsEl = document.getElementById('monthly-subs-content');
+        const recommendedEl = document.getElementById('recommended-content');
+        const refreshBtn = document.getElementById('btn-refresh-recommended');
+        const cooldownSpan = document.getElementById('recommended-cooldown');
         let subscriptionSortBy = 'subscribers';
+        let historyEtag = null;
+        let subscriptionsKey = null;  // 마지막으로 반영한 구독 목록 (JSON 문자열)
 
         async function load() {
             try {
-                const base = window.location.pathname.endsWith('/') ? window.location.pathname : window.location.pathname + '/';
-                const r = await fetch(base + 'api/history');
+                const headers = historyEtag ? { 'If-None-Match': historyEtag } : {};
+                const r = await fetch(API_BASE + 'api/history', { headers, cache: 'no-store' });
+                if (r.status === 304) return;  // 변경 없음 → 기존 데이터/화면 유지
+                const prev = historyData;
                 historyData = await r.json();
+                historyEtag = r.headers.get('ETag');
+                // 구독 목록이 그대로면 이전 객체/정렬/노드를 그대로 사용 (다른 데이터만 바뀐 경우 재렌더 없음)
+                const subsKey = JSON.stringify(historyData.subscriptions);
+                const subsChanged = subsKey !== subscriptionsKey;
+                if (subsChanged) {
+                    subscriptionsKey = subsKey;
+                    const channels = (historyData.subscriptions && historyData.subscriptions.channels) || [];
+                    historyData._subscriptions_by_subscribers = [...channels].sort((a, b) => (b.subscriber_count || 0) - (a.subscriber_count || 0));
+                } else {
+                    historyData.subscriptions = prev.subscriptions;
+                    historyData._subscriptions_by_subscribers = prev._subscriptions_by_subscribers;
+                }
+                // 월 목록은 데이터가 바뀔 때 한 번만 계산 (월 선택 시 재사용)
+                historyData._months_sorted = getMonthsFromByDate();
                 renderCookieStatus();
                 const recTab = document.querySelector('.tab-recommended');
                 if (recTab) recTab.style.display = (historyData.fetch_recommended === true) ? '' : 'none';
-                renderDaily();
-                renderMonthly();
-                renderSubscriptions();
-                renderMonthlySubscriptions();
-                renderRecommended();
+                renderPanels(subsChanged ? [] : ['subscriptions']);
             } catch (e) {
+                historyEtag = null;  // 다음 폴링은 304 대신 전체 응답 → 오류 표시가 정상 상태로 다시 그려짐
                 document.getElementById('cookie-status').className = 'cookie-status disconnected';
                 document.getElementById('cookie-status').textContent = '연결 오류';
                 document.getElementById('status').className = 'status error';
@@ -633,36 +1049,29 @@ def _get_ui_html() -> str:
                 return;
             }
 
-            content.innerHTML = dates.map(date => {
+            // 템플릿 복제 + DocumentFragment로 한 번에 교체 (HTML 파싱/escape 없음)
+            const tplDate = document.getElementById('tpl-date').content.firstElementChild;
+            const tplVideo = document.getElementById('tpl-video').content.firstElementChild;
+            const frag = document.createDocumentFragment();
+            for (const date of dates) {
                 const entries = historyData.by_date[date] || [];
-                return `
-                    <div class="date-group" data-date="${date}">
-                        <div class="date-header">
-                            <span class="date">${date}</span>
-                            <span class="count">${entries.length}개</span>
-                            <span class="chevron">▼</span>
-                        </div>
-                        <div class="date-content">
-                            ${entries.map(v => `
-                                <a href="${v.url}" target="_blank" class="video" style="text-decoration:none;color:inherit;">
-                                    <img src="${v.thumbnail || ''}" alt="">
-                                    <div class="info">
-                                        <div class="title">${escapeHtml(v.title)}</div>
-                                        <div class="channel">${escapeHtml(v.channel)}</div>
-                                        <div class="meta">${v.duration} · ${formatTime(v.timestamp)}</div>
-                                    </div>
-                                </a>
-                            `).join('')}
-                        </div>
-                    </div>
-                `;
-            }).join('');
-
-            content.querySelectorAll('.date-header').forEach(el => {
-                el.addEventListener('click', () => {
-                    el.closest('.date-group').classList.toggle('collapsed');
-                });
-            });
+                const group = tplDate.cloneNode(true);
+                group.dataset.date = date;
+                group.querySelector('.date').textContent = date;
+                group.querySelector('.count').textContent = entries.length + '개';
+                const list = group.querySelector('.date-content');
+                for (const v of entries) {
+                    const a = tplVideo.cloneNode(true);
+                    a.href = v.url;
+                    a.querySelector('img').src = v.thumbnail || '';
+                    a.querySelector('.title').textContent = v.title || '';
+                    a.querySelector('.channel').textContent = v.channel || '';
+                    a.querySelector('.meta').textContent = v.duration + ' · ' + formatTime(v.timestamp);
+                    list.appendChild(a);
+                }
+                frag.appendChild(group);
+            }
+            content.replaceChildren(frag);
         }
 
         function getMonthsFromByDate() {
@@ -672,181 +1081,198 @@ def _get_ui_html() -> str:
             return Array.from(set).sort().reverse();
         }
 
+        let monthOptionsKey = null;  // month-select에 마지막으로 채운 월 목록
+
         function renderMonthly() {
             const wrap = document.getElementById('calendar-grid');
             const selectEl = document.getElementById('month-select');
             const dayDetailEl = document.getElementById('calendar-day-detail');
             if (!wrap || !selectEl) return;
 
-            const months = getMonthsFromByDate();
+            const months = historyData._months_sorted || getMonthsFromByDate();
             if (months.length === 0) {
                 wrap.innerHTML = '';
                 selectEl.innerHTML = '<option value="">기록 없음</option>';
+                monthOptionsKey = null;
                 dayDetailEl.style.display = 'none';
                 return;
             }
 
             const byDate = historyData.by_date || {};
-            selectEl.innerHTML = months.map(m => {
-                const [y, mo] = m.split('-');
-                const label = y + '년 ' + parseInt(mo, 10) + '월';
-                return '<option value="' + m + '">' + label + '</option>';
-            }).join('');
+            // 월 목록이 그대로면 option을 다시 만들지 않음 (선택한 월도 유지)
+            const key = months.join(',');
+            if (key !== monthOptionsKey) {
+                selectEl.innerHTML = months.map(m => {
+                    const [y, mo] = m.split('-');
+                    return '<option value="' + m + '">' + y + '년 ' + parseInt(mo, 10) + '월</option>';
+                }).join('');
+                monthOptionsKey = key;
+            }
 
             const selectedMonth = selectEl.value || months[0];
             selectEl.value = selectedMonth;
-            renderCalendarForMonth(selectedMonth, byDate, wrap, dayDetailEl);
+            renderCalendarForMonth(selectedMonth, byDate, wrap);
 
             selectEl.onchange = () => {
                 dayDetailEl.style.display = 'none';
-                renderCalendarForMonth(selectEl.value, historyData.by_date || {}, wrap, dayDetailEl);
+                renderCalendarForMonth(selectEl.value, historyData.by_date || {}, wrap);
             };
         }
 
-        function renderCalendarForMonth(monthStr, byDate, gridEl, dayDetailEl) {
-            const weekdays = ['일', '월', '화', '수', '목', '금', '토'];
+        // 일자 → 두 자리 문자열 ("01".."31"), 렌더마다 다시 만들지 않음
+        const DAY_KEYS = Array.from({ length: 32 }, (_, i) => String(i).padStart(2, '0'));
+        // 요일 헤더/빈 칸 HTML도 한 번만 생성
+        const CAL_WEEKDAY_HTML = ['일', '월', '화', '수', '목', '금', '토']
+            .map(w => '<div class="calendar-weekday">' + w + '</div>').join('');
+        const CAL_EMPTY_CELL = '<div class="calendar-day calendar-day-empty"></div>';
+
+        function renderCalendarForMonth(monthStr, byDate, gridEl) {
             const [y, m] = monthStr.split('-').map(Number);
             const first = new Date(y, m - 1, 1);
             const last = new Date(y, m, 0);
             const firstDay = first.getDay();
             const daysInMonth = last.getDate();
 
-            let html = weekdays.map(w => '<div class="calendar-weekday">' + w + '</div>').join('');
+            // 요일 헤더 + 앞 빈 칸 + 날짜 + 뒤 빈 칸(총 42칸)을 배열에 모아 한 번에 join
+            const parts = new Array(3 + daysInMonth);
+            let k = 0;
+            parts[k++] = CAL_WEEKDAY_HTML;
 
-            const pad = n => (n < 10 ? '0' + n : '' + n);
+            const datePrefix = monthStr + '-';  // "YYYY-MM-"
             const emptyCells = firstDay;
-            for (let i = 0; i < emptyCells; i++) html += '<div class="calendar-day calendar-day-empty"></div>';
+            parts[k++] = CAL_EMPTY_CELL.repeat(emptyCells);
 
             for (let d = 1; d <= daysInMonth; d++) {
-                const dateKey = y + '-' + pad(m) + '-' + pad(d);
+                const dateKey = datePrefix + DAY_KEYS[d];
                 const entries = byDate[dateKey] || [];
                 const count = entries.length;
-                const hasCount = count > 0;
-                const cls = 'calendar-day' + (hasCount ? ' has-count' : '');
-                html += '<div class="' + cls + '" data-date="' + dateKey + '" data-count="' + count + '">';
-                html += '<span class="calendar-day-num">' + d + '</span>';
-                html += '<span class="calendar-day-count">' + (count || '') + '</span>';
-                html += '</div>';
+                const cls = count > 0 ? 'calendar-day has-count' : 'calendar-day';
+                parts[k++] = '<div class="' + cls + '" data-date="' + dateKey + '" data-count="' + count + '">' +
+                    '<span class="calendar-day-num">' + d + '</span>' +
+                    '<span class="calendar-day-count">' + (count || '') + '</span></div>';
             }
 
             const totalCells = 7 * 6;
             const filled = emptyCells + daysInMonth;
-            for (let i = filled; i < totalCells; i++) html += '<div class="calendar-day calendar-day-empty"></div>';
-
-            gridEl.innerHTML = html;
-
-            gridEl.querySelectorAll('.calendar-day.has-count').forEach(cell => {
-                cell.addEventListener('click', () => {
-                    const dateKey = cell.dataset.date;
-                    const entries = byDate[dateKey] || [];
-                    if (!dayDetailEl) return;
-                    dayDetailEl.style.display = 'block';
-                    dayDetailEl.innerHTML = '<h4>' + dateKey + ' · ' + entries.length + '개</h4>' +
-                        entries.map(v => `
-                            <a href="${v.url}" target="_blank" class="video" style="text-decoration:none;color:inherit;display:block;margin-bottom:8px;">
-                                <div class="info">
-                                    <div class="title">${escapeHtml(v.title)}</div>
-                                    <div class="channel">${escapeHtml(v.channel)}</div>
-                                </div>
-                            </a>
-                        `).join('');
-                });
-            });
+            parts[k++] = CAL_EMPTY_CELL.repeat(totalCells - filled);
+
+            gridEl.innerHTML = parts.join('');
+        }
+
+        // 날짜 칸 클릭은 calendar-grid에 위임된 리스너 하나가 처리
+        function showCalendarDay(dateKey) {
+            const dayDetailEl = document.getElementById('calendar-day-detail');
+            const entries = (historyData.by_date || {})[dateKey] || [];
+            if (!dayDetailEl) return;
+            dayDetailEl.style.display = 'block';
+            dayDetailEl.innerHTML = '<h4>' + dateKey + ' · ' + entries.length + '개</h4>' +
+                entries.map(v => `
+                    <a href="${v.url}" target="_blank" class="video" style="text-decoration:none;color:inherit;display:block;margin-bottom:8px;">
+                        <div class="info">
+                            <div class="title">${escapeHtml(v.title)}</div>
+                            <div class="channel">${escapeHtml(v.channel)}</div>
+                        </div>
+                    </a>
+                `).join('');
         }
 
+        // 채널 객체 → 목록의 <a> 노드. 데이터 로드 시 한 번 만들고 정렬 변경 시에는 노드 이동만
+        let subscriptionNodes = null;
+
         function renderSubscriptions() {
-            const el = document.getElementById('subscriptions-content');
-            const btn = document.getElementById('btn-subscription-sort');
+            const el = subscriptionsEl;
             const sub = historyData.subscriptions;
+            subscriptionNodes = null;
             if (!sub) {
                 el.innerHTML = '<div class="empty">구독 채널 정보를 불러오는 중...</div>';
                 return;
             }
             const total = sub.total_count || 0;
-            let channels = sub.channels || [];
+            const channels = sub.channels || [];
             if (total === 0 && channels.length === 0) {
                 el.innerHTML = '<div class="empty">구독 채널이 없거나 쿠키를 확인해 주세요.</div>';
                 return;
             }
-            if (subscriptionSortBy === 'subscribers') {
-                channels = [...channels].sort((a, b) => (b.subscriber_count || 0) - (a.subscriber_count || 0));
-                if (btn) btn.textContent = '기본 순';
-            } else {
-                if (btn) btn.textContent = '구독자 순';
+            el.innerHTML = '<div class="stat-card" style="margin-bottom:16px; text-align:left;">' +
+                '<div class="value">' + total + '</div><div class="label"></div></div>' +
+                '<div class="channel-list" style="display:grid; gap:8px; text-align:left;"></div>';
+
+            // 템플릿 복제 + textContent (escape/HTML 파싱 없음), 노드는 정렬 변경 시 재사용
+            const tpl = document.getElementById('tpl-channel-row').content.firstElementChild;
+            const frag = document.createDocumentFragment();
+            subscriptionNodes = new Map();
+            for (const c of channels) {
+                const a = tpl.cloneNode(true);
+                a.href = c.channel_url || '#';
+                a.querySelector('img').src = c.thumbnail || '';
+                a.querySelector('.title').textContent = c.channel_name || '';
+                const meta = [c.handle, c.subscriber_count_text].filter(Boolean).join(' · ');
+                const metaEl = a.querySelector('.channel-meta');
+                if (meta) metaEl.textContent = meta; else metaEl.remove();
+                const descEl = a.querySelector('.channel-desc');
+                if (c.description_snippet) descEl.textContent = c.description_snippet.substring(0, 80); else descEl.remove();
+                subscriptionNodes.set(c, a);
+                frag.appendChild(a);
             }
-            const sortLabel = subscriptionSortBy === 'subscribers' ? '구독자 많은 순' : '한글·영어·특수문자 순';
-            el.innerHTML = `
-                <div class="stat-card" style="margin-bottom:16px; text-align:left;">
-                    <div class="value">${total}</div>
-                    <div class="label">구독 중인 채널 (${sortLabel})</div>
-                </div>
-                <div class="channel-list" style="display:grid; gap:8px; text-align:left;">
-                    ${channels.map(c => {
-                        const url = c.channel_url || '#';
-                        const thumb = c.thumbnail || '';
-                        const name = escapeHtml(c.channel_name || '');
-                        const handle = c.handle ? escapeHtml(c.handle) : '';
-                        const subs = c.subscriber_count_text ? escapeHtml(c.subscriber_count_text) : '';
-                        const meta = [handle, subs].filter(Boolean).join(' · ');
-                        const desc = c.description_snippet ? escapeHtml(c.description_snippet).substring(0, 80) : '';
-                        return `
-                        <a href="${url}" target="_blank" class="video channel-item" style="text-decoration:none; color:inherit; cursor:pointer;">
-                            <img src="${thumb}" alt="" style="width:56px; height:56px; object-fit:cover; border-radius:50%; flex-shrink:0;">
-                            <div class="info" style="flex:1; min-width:0;">
-                                <div class="title">${name}</div>
-                                ${meta ? `<div class="channel-meta" style="color:var(--ha-text-secondary); font-size:0.85em;">${meta}</div>` : ''}
-                                ${desc ? `<div class="channel-desc" style="color:var(--ha-text-secondary); font-size:0.8em; margin-top:2px; white-space:nowrap; overflow:hidden; text-overflow:ellipsis;">${desc}</div>` : ''}
-                            </div>
-                        </a>
-                    `}).join('')}
-                </div>
-            `;
+            el.querySelector('.channel-list').appendChild(frag);
+            applySubscriptionOrder();
+        }
+
+        function applySubscriptionOrder() {
+            const bySubscribers = subscriptionSortBy === 'subscribers';
+            const btn = document.getElementById('btn-subscription-sort');
+            if (btn) btn.textContent = bySubscribers ? '기본 순' : '구독자 순';
+            if (!subscriptionNodes) return;
+            const el = subscriptionsEl;
+            el.querySelector('.stat-card .label').textContent =
+                '구독 중인 채널 (' + (bySubscribers ? '구독자 많은 순' : '한글·영어·특수문자 순') + ')';
+            const sub = historyData.subscriptions;
+            const channels = bySubscribers ? historyData._subscriptions_by_subscribers : sub.channels;
+            // 기존 노드를 새 순서로 fragment에 옮긴 뒤 한 번에 다시 붙임 (재생성 없음)
+            const frag = document.createDocumentFragment();
+            for (const c of channels || []) frag.appendChild(subscriptionNodes.get(c));
+            el.querySelector('.channel-list').appendChild(frag);
         }
 
         function renderMonthlySubscriptions() {
-            const el = document.getElementById('monthly-subs-content');
+            const el = monthlySubsEl;
             const changes = historyData.monthly_subscription_changes || {};
             const entries = Object.entries(changes);
             if (entries.length === 0) {
                 el.innerHTML = '<div class="empty">월별 구독 변경 내역이 없습니다. 구독 추가/해지 시 자동 기록됩니다.</div>';
                 return;
             }
-            el.innerHTML = entries.map(([month, data]) => {
+            const parts = [];
+            const row = (c, style) => '<div class="video" style="' + style + '"><div class="info"><div class="title">' + escapeHtml(c) + '</div></div></div>';
+            for (const [month, data] of entries) {
                 const added = data.added || [];
                 const removed = data.removed || [];
-                return `
-                <div class="date-group" style="margin-bottom:20px;">
-                    <div class="date-header">
-                        <span class="date">${month}</span>
-                        <span class="count">+${added.length} / -${removed.length}</span>
-                        <span class="chevron">▼</span>
-                    </div>
-                    <div class="date-content">
-                        ${added.length ? `
-                        <div style="margin-bottom:12px;">
-                            <div style="font-size:0.85rem; color:#4caf50; margin-bottom:6px;">신규 구독 (${added.length})</div>
-                            ${added.map(c => `<div class="video" style="cursor:default; padding:8px 12px;"><div class="info"><div class="title">${escapeHtml(c)}</div></div></div>`).join('')}
-                        </div>
-                        ` : ''}
-                        ${removed.length ? `
-                        <div>
-                            <div style="font-size:0.85rem; color:#f44336; margin-bottom:6px;">구독 취소 (${removed.length})</div>
-                            ${removed.map(c => `<div class="video" style="cursor:default; padding:8px 12px; opacity:0.8;"><div class="info"><div class="title">${escapeHtml(c)}</div></div></div>`).join('')}
-                        </div>
-                        ` : ''}
-                    </div>
-                </div>
-                `;
-            }).join('');
-
-            el.querySelectorAll('.date-header').forEach(h => {
-                h.addEventListener('click', () => h.closest('.date-group').classList.toggle('collapsed'));
-            });
+                parts.push(
+                    '<div class="date-group" style="margin-bottom:20px;"><div class="date-header">' +
+                    '<span class="date">' + month + '</span>' +
+                    '<span class="count">+' + added.length + ' / -' + removed.length + '</span>' +
+                    '<span class="chevron">▼</span></div><div class="date-content">'
+                );
+                if (added.length) {
+                    parts.push('<div style="margin-bottom:12px;"><div style="font-size:0.85rem; color:#4caf50; margin-bottom:6px;">신규 구독 (' + added.length + ')</div>');
+                    for (const c of added) parts.push(row(c, 'cursor:default; padding:8px 12px;'));
+                    parts.push('</div>');
+                }
+                if (removed.length) {
+                    parts.push('<div><div style="font-size:0.85rem; color:#f44336; margin-bottom:6px;">구독 취소 (' + removed.length + ')</div>');
+                    for (const c of removed) parts.push(row(c, 'cursor:default; padding:8px 12px; opacity:0.8;'));
+                    parts.push('</div>');
+                }
+                parts.push('</div></div>');
+            }
+            el.innerHTML = parts.join('');
         }
 
+        let cooldownTimer = null;  // 쿨다운이 남아 있고 화면이 보일 때만 1초 간격 갱신
+
         function updateRecommendedCooldown() {
-            const btn = document.getElementById('btn-refresh-recommended');
-            const span = document.getElementById('recommended-cooldown');
+            const btn = refreshBtn;
+            const span = cooldownSpan;
             if (!btn || !span) return;
             const now = Math.floor(Date.now() / 1000);
             const availableAt = historyData.recommended_refresh_available_at || 0;
@@ -860,14 +1286,20 @@ def _get_ui_html() -> str:
                 btn.disabled = false;
                 span.textContent = '';
             }
+            const ticking = remaining > 0 && document.visibilityState === 'visible';
+            if (ticking && !cooldownTimer) {
+                cooldownTimer = setInterval(updateRecommendedCooldown, 1000);
+            } else if (!ticking && cooldownTimer) {
+                clearInterval(cooldownTimer);
+                cooldownTimer = null;
+            }
         }
 
         async function refreshRecommended() {
-            const btn = document.getElementById('btn-refresh-recommended');
+            const btn = refreshBtn;
             if (btn && btn.disabled) return;
             try {
-                const base = window.location.pathname.endsWith('/') ? window.location.pathname : window.location.pathname + '/';
-                const r = await fetch(base + 'api/refresh/recommended', { method: 'POST' });
+                const r = await fetch(API_BASE + 'api/refresh/recommended', { method: 'POST' });
                 const data = await r.json();
                 if (r.ok && data.status === 'ok') {
                     historyData.recommended = data.recommended || [];
@@ -886,29 +1318,31 @@ def _get_ui_html() -> str:
         }
 
         function renderRecommended() {
-            const el = document.getElementById('recommended-content');
+            const el = recommendedEl;
             const videos = historyData.recommended || [];
             updateRecommendedCooldown();
             if (!videos.length) {
                 el.innerHTML = '<div class="empty">추천 영상 정보를 불러오는 중...</div>';
                 return;
             }
-            el.innerHTML = videos.map(v => `
-                <a href="${v.url || '#'}" target="_blank" class="video" style="text-decoration:none; color:inherit; display:block; margin-bottom:12px;">
-                    <img src="${v.thumbnail || ''}" alt="">
-                    <div class="info">
-                        <div class="title">${escapeHtml(v.title)}</div>
-                        <div class="channel">${escapeHtml(v.channel)}</div>
-                        <div class="meta">${v.duration || ''}</div>
-                    </div>
-                </a>
-            `).join('');
+            const tpl = document.getElementById('tpl-recommended').content.firstElementChild;
+            const frag = document.createDocumentFragment();
+            for (const v of videos) {
+                const a = tpl.cloneNode(true);
+                a.href = v.url || '#';
+                a.querySelector('img').src = v.thumbnail || '';
+                a.querySelector('.title').textContent = v.title || '';
+                a.querySelector('.channel').textContent = v.channel || '';
+                a.querySelector('.meta').textContent = v.duration || '';
+                frag.appendChild(a);
+            }
+            el.replaceChildren(frag);
         }
 
+        // DOM 노드 없이 문자열 치환만으로 escape (속성 값용 따옴표 포함)
+        const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
         function escapeHtml(s) {
-            const d = document.createElement('div');
-            d.textContent = s || '';
-            return d.innerHTML;
+            return s ? String(s).replace(/[&<>"']/g, c => HTML_ESCAPES[c]) : '';
         }
 
         function formatTime(iso) {
@@ -919,31 +1353,80 @@ def _get_ui_html() -> str:
             } catch { return ''; }
         }
 
+        // 다시 그릴 때마다 붙이지 않도록 컨테이너에 클릭 리스너를 한 번만 위임
+        document.getElementById('calendar-grid').addEventListener('click', e => {
+            const cell = e.target.closest('.calendar-day.has-count');
+            if (cell) showCalendarDay(cell.dataset.date);
+        });
+        ['daily-content', 'monthly-subs-content'].forEach(id => {
+            document.getElementById(id).addEventListener('click', e => {
+                const header = e.target.closest('.date-header');
+                if (header) header.closest('.date-group').classList.toggle('collapsed');
+            });
+        });
+
+        // 탭별 렌더 함수. 데이터가 바뀌면 현재 탭만 그리고 나머지는 처음 열 때 그림
+        const PANEL_RENDERERS = {
+            'daily': renderDaily,
+            'monthly': renderMonthly,
+            'subscriptions': renderSubscriptions,
+            'monthly-subs': renderMonthlySubscriptions,
+            'recommended': renderRecommended,
+        };
+        const stalePanels = new Set();
+
+        function renderPanel(name) {
+            if (stalePanels.delete(name)) PANEL_RENDERERS[name]();
+        }
+
+        function renderPanels(unchanged) {
+            // unchanged: 데이터가 그대로인 탭 (이미 그렸으면 다시 그리지 않음)
+            Object.keys(PANEL_RENDERERS).forEach(name => { if (!unchanged.includes(name)) stalePanels.add(name); });
+            const active = document.querySelector('.tab.active[data-tab]');
+            renderPanel(active ? active.dataset.tab : 'daily');
+        }
+
         document.querySelectorAll('.tab').forEach(tab => {
             tab.addEventListener('click', () => {
                 if (!tab.dataset.tab) return;
                 document.querySelectorAll('.tab').forEach(t=>t.classList.remove('active'));
                 document.querySelectorAll('.panel').forEach(p=>p.classList.remove('active'));
                 tab.classList.add('active');
+                renderPanel(tab.dataset.tab);
                 document.getElementById('panel-' + tab.dataset.tab).classList.add('active');
             });
         });
 
-        document.getElementById('btn-refresh-recommended')?.addEventListener('click', refreshRecommended);
-        document.getElementById('btn-subscription-sort')?.addEventListener('click', async () => {
+        refreshBtn?.addEventListener('click', refreshRecommended);
+        document.getElementById('btn-subscription-sort')?.addEventListener('click', () => {
             subscriptionSortBy = subscriptionSortBy === 'default' ? 'subscribers' : 'default';
-            const el = document.getElementById('subscriptions-content');
-            if (el) el.innerHTML = '<div class="empty">새로고침 중...</div>';
-            await load();
+            applySubscriptionOrder();
         });
         load();
-        setInterval(load, 60000);
-        setInterval(updateRecommendedCooldown, 1000);
+        // 숨겨진 탭/iframe에서는 폴링하지 않고, 다시 보이면 바로 갱신
+        setInterval(() => { if (document.visibilityState === 'visible') load(); }, 60000);
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'visible') load();
+            updateRecommendedCooldown();
+        });
     </script>
 </body>
 </html>"""
 
 
+# UI HTML은 실행 중 바뀌지 않으므로 import 시 한 번만 인코딩/압축
+# (본문, Content-Length 문자열) 쌍으로 보관
+_ui_raw = _get_ui_html().encode("utf-8")
+_ui_gzip = gzip.compress(_ui_raw, compresslevel=6)
+_UI_BODY_PLAIN = (_ui_raw, str(len(_ui_raw)))
+_UI_BODY_GZIP = (_ui_gzip, str(len(_ui_gzip)))
+_UI_HTML_ETAG = '"%s"' % hashlib.md5(_ui_raw, usedforsecurity=False).hexdigest()[:16]
+# 60초 동안은 재검증 없이 브라우저 캐시 사용, 이후에는 ETag로 304
+UI_CACHE_MAX_AGE = 60
+_UI_CACHE_CONTROL = "max-age=%d" % UI_CACHE_MAX_AGE
+del _ui_raw, _ui_gzip
+
+
 def init_mqtt() -> None:
     """HA Supervisor에서 MQTT 정보 받아 연결, Discovery 발행."""
     global mqtt_pub
@@ -972,30 +1455,32 @@ def main() -> None:
     port = opts.get("port", 8765)
     interval = opts.get("scan_interval", 60)
     _LOGGER.info("[%s] 설정 로드 완료 | cookies_path=%s | port=%s | scan_interval=%ds", "10%", cookies_path, port, interval)
+    with _history_lock:
+        _history_store.load()
+    threading.Thread(target=_history_saver, daemon=True).start()
 
     fetcher = YouTubeHistoryFetcher(cookies_path)
-    _LOGGER.info("[%s] 시청 기록 조회 중... (약 1분 소요 됩니다)", "20%")
-    fetcher.fetch_history()
-    time.sleep(2)
+    fetch_recommended = opts.get("fetch_recommended", True)
+    # 시청 기록 / 구독 채널 / 추천 영상은 서로 독립 → 병렬 조회로 시작 시간 단축
+    _LOGGER.info("[%s] 시청 기록/구독 채널%s 조회 중... (약 1분 소요 됩니다)", "20%", "/추천 영상" if fetch_recommended else "")
+    fetcher.fetch_all(include_recommended=fetch_recommended)
+    _last_subscriptions_fetch = time.time()
+    if fetch_recommended:
+        _last_recommended_fetch = _last_subscriptions_fetch
+
     cookies_ok = fetcher.cookies_valid
     n_history = len(fetcher.history_data or [])
-    _LOGGER.info("[%s] 시청 기록 조회 완료 | 쿠키=%s | 최근 %d건", "30%", "유효" if cookies_ok else "무효", n_history)
+    _LOGGER.info("[%s] 시청 기록 조회 완료 | 쿠키=%s | 최근 %d건", "40%", "유효" if cookies_ok else "무효", n_history)
 
-    _LOGGER.info("[%s] 구독 채널 조회 중...", "40%")
-    fetcher.fetch_subscriptions()
-    _last_subscriptions_fetch = time.time()
     sub_data = fetcher.subscriptions_data
     n_subs = len(sub_data.get("channels", [])) if sub_data else 0
     if sub_data and sub_data.get("channels"):
         with _subs_lock:
             update_subscription_changes(sub_data["channels"])
+    _bump_data_revision()
     _LOGGER.info("[%s] 구독 채널 조회 완료 | %d개 채널 반영", "55%", n_subs)
 
-    if opts.get("fetch_recommended", True):
-        time.sleep(2)
-        _LOGGER.info("[%s] 추천 영상 조회 중...", "65%")
-        fetcher.fetch_recommended()
-        _last_recommended_fetch = time.time()
+    if fetch_recommended:
         n_rec = len(fetcher.recommended_data or [])
         _LOGGER.info("[%s] 추천 영상 조회 완료 | %d건", "75%", n_rec)
     else:
@@ -1014,15 +1499,29 @@ def main() -> None:
     thread = threading.Thread(target=fetch_loop, daemon=True)
     thread.start()
 
-    server = HTTPServer(("0.0.0.0", port), YouTubeMonitoringHandler)
+    # 요청별 스레드: 느린 /api/history가 /api/health, /api/ingest를 막지 않음
+    server = ThreadingHTTPServer(("0.0.0.0", port), YouTubeMonitoringHandler)
+    server.daemon_threads = True
     _LOGGER.info("[%s] HTTP 서버 대기 중 | port=%s", "95%", port)
     _LOGGER.info("[%s] 에드온 정상 실행 | 쿠키=%s | http://0.0.0.0:%s", "100%", "유효" if cookies_ok else "무효", port)
 
+    def _on_sigterm(signum, frame) -> None:
+        # serve_forever와 같은 스레드에서 shutdown()을 부르면 멈추므로 별도 스레드에서
+        _LOGGER.info("Shutting down")
+        _stop.set()
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         _LOGGER.info("Shutting down")
+        _stop.set()
         server.shutdown()
+    finally:
+        with _history_lock:
+            _history_store.flush()
 
 
 if __name__ == "__main__":